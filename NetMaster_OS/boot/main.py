@@ -15,12 +15,17 @@
     - **GPIO Setup:** Basic GPIO setup is done early in the code, defining constants for the LED and DHT11 sensor pins.
     
     - **Device Information:** The code initializes device-specific constants like `DEVICE_NAME` and network configuration parameters, setting up the core identity and connectivity options.
+      Their values come from `config_store` (`config.json` on flash) and can be changed with a POST to `/api/config`.
     
     - **Core Functions:**
         - `led_on_off()` and `led_blink()` provide basic LED control for visual feedback.
         - `wifi_connect()`, `wifi_search()`, and `wifi_ap()` handle WiFi management, including connecting to existing networks, scanning for available networks, and setting up an access point.
         - `boot_screen()` displays essential system information on startup, mimicking a Linux boot screen.
         - `cmd()` processes API commands sent via the web interface, primarily for WiFi control at this stage.
+        - Sensors are handled by `sensor_handler` (see `src/sensor_handler.py`), which samples every sensor in
+          `sensors.json` on a background scheduler; the latest readings are served at `/sensors`.
+        - `sensor_stats` keeps running statistics of every reading (`/stats`) and pushes changed
+          readings and alerts from `alerts.json` to `/events` subscribers.
         - `host_website()` is responsible for hosting the web server, which listens for incoming HTTP requests and serves appropriate responses.
     
     - **Main Execution Flow:**
@@ -35,24 +40,31 @@
 
 
 import network,time,ubinascii,uos,socket,machine,ujson
-import machine,dht,gc,_thread,ubinascii
+import machine,gc,_thread,ubinascii
 from machine import Pin, unique_id
+import sensor_handler,sensor_stats,sensor_export,config_store,discovery
+
+# Settings are kept in config.json and changed through /api/config
+CONFIG = config_store.load({'device_name': "Nikhil's NetMaster_OS"})
 
 # GPIO PIN SETUP ACCORDING TO ESP32 
-GPIO_LED = 2
-GPIO_DHT11 = 4
-led_pin = Pin(GPIO_LED, Pin.OUT)
-sensor = dht.DHT11(DHT_PIN)
+GPIO_LED = CONFIG['gpio_led']
+GPIO_DHT11 = CONFIG['gpio_dht11']
 led_pin = Pin(GPIO_LED, Pin.OUT)
 
-DEVICE_NAME = "Nikhil's NetMaster_OS"
+# Sensors come from sensors.json; without it only the DHT11 on GPIO_DHT11 is used
+DEFAULT_SENSORS = [
+    {'name': 'dht11', 'driver': 'dht11', 'pin': GPIO_DHT11, 'interval': 2000},
+]
+
+DEVICE_NAME = CONFIG['device_name']
 
 # Manually Network setup
-IP_ADDR = '192.168.1.1'
-GATEWAY = IP_ADDR
-SUBNET = '255.255.255.0'
-DNS_ONE = '8.8.8.8'
-DNS_TWO = '8.8.4.4'
+IP_ADDR = CONFIG['ip_addr']
+GATEWAY = CONFIG['gateway']
+SUBNET = CONFIG['subnet']
+DNS_ONE = CONFIG['dns_one']
+DNS_TWO = CONFIG['dns_two']
 
 # Define GPIO and other constants
 def led_on_off(delay=2, times=2):
@@ -228,13 +240,54 @@ def host_website():
         print(f'Request Line: {request_line}')
         
         # Read the rest of the request (headers, etc.)
+        content_length = 0
+        accept = ''
         while True:
             line = cl_file.readline()
             if not line or line == b'\r\n':
                 break
+            if line.lower().startswith(b'content-length:'):
+                try:
+                    content_length = int(line[15:])
+                except ValueError:
+                    content_length = -1  # Answered with 400 below
+            elif line.lower().startswith(b'accept:'):
+                accept = line[7:].decode('utf-8').strip()
         
         # Process request
-        if request_line.startswith("GET /"):
+        if content_length < 0:
+            response = (
+                "HTTP/1.1 400 Bad Request\r\n"
+                "Content-Type: text/plain\r\n"
+                "\r\n"
+                "400 Bad Request: Invalid Content-Length."
+            )
+        elif content_length > config_store.MAX_BODY:
+            # Never try to buffer a body that does not fit in the ESP32's RAM
+            response = (
+                "HTTP/1.1 413 Payload Too Large\r\n"
+                "Content-Type: text/plain\r\n"
+                "\r\n"
+                "413 Payload Too Large."
+            )
+        elif request_line.startswith("POST /api/config"):
+            try:
+                error = config_store.update(ujson.loads(cl_file.read(content_length)))
+            except (ValueError, AttributeError):
+                error = "Body must be a JSON object of settings."
+            if error is None:
+                response = (
+                    "HTTP/1.1 200 OK\r\n"
+                    "Content-Type: application/json\r\n"
+                    "\r\n" + ujson.dumps({'saved': True, 'restart_required': True})
+                )
+            else:
+                response = (
+                    "HTTP/1.1 400 Bad Request\r\n"
+                    "Content-Type: text/plain\r\n"
+                    "\r\n" + error
+                )
+        elif request_line.startswith("GET /"):
             # Extract the path from the request line
             path = request_line.split(' ')[1]  # Split and get the path
             
@@ -247,6 +300,8 @@ def host_website():
                     "<a href='/cmd/wifi?connect&ssid=Airtel_Zeus&password=TheBestWifi'>Connect to WiFi</a><br>"
                     "<a href='/cmd/wifi?scan'>Scan WiFi Networks</a><br>"
                     "<a href='/cmd/wifi?ap&name=MyAP&password=MyPassword'>Create WiFi AP</a><br>"
+                    "<a href='/sensors'>Sensor readings</a><br>"
+                    "<a href='/stats'>Sensor statistics</a><br>"
                     "<a href='/cmd=help'>Click here for help</a>"
                 )
             elif path.startswith("/cmd/wifi"):
@@ -266,6 +321,49 @@ def host_website():
                     "\r\n" +
                     cmd('wifi ' + query_string)
                 )
+            elif path == "/api/config":
+                response = (
+                    "HTTP/1.1 200 OK\r\n"
+                    "Content-Type: application/json\r\n"
+                    "\r\n" + ujson.dumps(config_store.public())
+                )
+            elif path == "/stats":
+                response = (
+                    "HTTP/1.1 200 OK\r\n"
+                    "Content-Type: application/json\r\n"
+                    "\r\n" + sensor_stats.stats_json()
+                )
+            elif path == "/events":
+                # Keep the connection open, sensor_stats pushes readings and alerts to it
+                sensor_stats.add_client(cl)
+                continue
+            elif path.startswith("/sensors"):
+                path, _, query = path.partition("?")
+                if path.startswith("/sensors/") and path.endswith("/history"):
+                    name = path[len("/sensors/"):-len("/history")]
+                    content_type = sensor_export.negotiate(accept, query)
+                    hist = sensor_handler.history.get(name)
+                    if hist is not None and content_type != sensor_export.JSON:
+                        # Binary formats are sent from a copy of the history buffers, without per-sample objects
+                        sensor_export.send(cl, name, hist, content_type)
+                        cl.close()
+                        continue
+                    body = sensor_handler.history_json(name)
+                else:
+                    body = sensor_handler.sensors_json()
+                if body is not None:
+                    response = (
+                        "HTTP/1.1 200 OK\r\n"
+                        "Content-Type: application/json\r\n"
+                        "\r\n" + body
+                    )
+                else:
+                    response = (
+                        "HTTP/1.1 404 Not Found\r\n"
+                        "Content-Type: text/plain\r\n"
+                        "\r\n"
+                        "404 Not Found: Unknown sensor."
+                    )
             else:
                 response = (
                     "HTTP/1.1 404 Not Found\r\n"
@@ -316,6 +414,13 @@ def main():
     # Print boot screen
     boot_screen()
     time.sleep(1)
+    # Sample the configured sensors in the background
+    sensor_handler.load_config('sensors.json', DEFAULT_SENSORS)
+    sensor_stats.actions['led'] = lambda event: _thread.start_new_thread(led_blink, ())
+    sensor_stats.attach('alerts.json')
+    _thread.start_new_thread(sensor_handler.run, ())
+    # Let host tools find this device with a UDP broadcast
+    discovery.start(DEVICE_NAME)
     # Start hosting the website
     print("WiFi AP is on. Connect to the network and access the website.")
     led_pin.off()
@@ -0,0 +1,23 @@
+"""
+            @project NetMaster_OS
+            @date 19-10-2026
+
+    Host-side tools for running a fleet of NetMaster_OS devices.
+
+    - `discovery`: Find devices with the UDP broadcast answered by `src/discovery.py`.
+    - `client`: Asyncio HTTP client keeping keep-alive connections per device.
+    - `collector`: Poll every device concurrently and append the results to a file.
+    - `export`: Decoders for the binary sensor history exports.
+    - `simulator`: Fake devices on localhost, for testing and benchmarking.
+
+    Run `python -m netmaster_fleet --help` from the `host` folder for the CLI.
+"""
+
+from .client import DeviceClient
+from .collector import Device, poll_fleet
+from .discovery import discover
+from .export import decode, decode_cbor, decode_packed
+from .store import TimeSeriesWriter
+
+__all__ = ['Device', 'DeviceClient', 'TimeSeriesWriter', 'decode', 'decode_cbor', 'decode_packed',
+           'discover', 'poll_fleet']
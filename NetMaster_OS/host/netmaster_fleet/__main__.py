@@ -0,0 +1,149 @@
+"""
+            @project NetMaster_OS
+            @date 19-10-2026
+
+    Command line interface, run from the `host` folder:
+
+        python -m netmaster_fleet discover
+        python -m netmaster_fleet poll --discover --rounds 0 --interval 5 --output fleet.jsonl
+        python -m netmaster_fleet poll --device 192.168.1.7 --device 192.168.1.8:8080
+        python -m netmaster_fleet simulate --count 20 --base-port 8100
+        python -m netmaster_fleet bench --count 30
+        python -m netmaster_fleet export --device 192.168.1.7 --sensor dht11 --format packed
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+
+from .bench import run_bench
+from .client import DeviceClient
+from .collector import DEFAULT_PATHS, Device, poll_fleet
+from .discovery import DISCOVERY_PORT, discover
+from .export import CBOR, PACKED, decode
+from .simulator import start_fleet, stop_fleet
+from .store import TimeSeriesWriter
+
+
+def _add_discovery_args(parser):
+    parser.add_argument('--address', default='255.255.255.255',
+                        help='broadcast address to discover on (127.0.0.1 for simulated devices)')
+    parser.add_argument('--discovery-port', type=int, default=DISCOVERY_PORT)
+    parser.add_argument('--timeout', type=float, default=2.0, help='seconds to wait for replies')
+
+
+async def _discover(args):
+    found = await discover(args.address, args.discovery_port, args.timeout)
+    for info in found:
+        print(json.dumps(info))
+    return 0
+
+
+async def _poll(args):
+    devices = [Device.parse(text) for text in args.device]
+    if args.discover:
+        found = await discover(args.address, args.discovery_port, args.timeout)
+        devices += [Device(info['host'], info['port'], info['name']) for info in found]
+    if not devices:
+        print('No devices given or discovered.', file=sys.stderr)
+        return 1
+    print(f'Polling {len(devices)} devices into {args.output}', file=sys.stderr)
+    with TimeSeriesWriter(args.output) as writer:
+        records = await poll_fleet(devices, args.path or DEFAULT_PATHS, args.rounds, args.interval,
+                                   writer, args.max_in_flight, args.request_timeout)
+    failed = sum(1 for record in records if record['status'] != 200)
+    print(f'Last round: {len(records) - failed} ok, {failed} failed', file=sys.stderr)
+    return 0
+
+
+async def _simulate(args):
+    devices, transport = await start_fleet(args.count, args.base_port, args.latency,
+                                           not args.close, args.discovery_port)
+    for device in devices:
+        print(f'{device.name} on 127.0.0.1:{device.port}')
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await stop_fleet(devices, transport)
+
+
+async def _export(args):
+    device = Device.parse(args.device)
+    client = DeviceClient(device.host, device.port, timeout=args.request_timeout)
+    try:
+        status, body = await client.get(f'/sensors/{args.sensor}/history?format={args.format}')
+        if status == 200 and args.format == 'json':
+            doc = json.loads(body)
+        elif status == 200:
+            doc = decode(body, CBOR if args.format == 'cbor' else PACKED)
+    except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError) as e:
+        print(f'{device.address}: {str(e) or type(e).__name__}', file=sys.stderr)
+        return 1
+    finally:
+        await client.close()
+    if status != 200:
+        print(f'{device.address} answered {status}: {body[:200]!r}', file=sys.stderr)
+        return 1
+    print(json.dumps(doc))
+    samples = len(doc['samples'])
+    print(f'{samples} samples in {len(body)} bytes', file=sys.stderr)
+    return 0
+
+
+async def _bench(args):
+    await run_bench(args.count, args.latency, args.rounds, args.max_in_flight)
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='netmaster_fleet', description='NetMaster_OS fleet tools')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    cmd = commands.add_parser('discover', help='list devices answering the discovery broadcast')
+    _add_discovery_args(cmd)
+    cmd.set_defaults(run=_discover)
+
+    cmd = commands.add_parser('poll', help='poll devices concurrently into a time-series file')
+    cmd.add_argument('--device', action='append', default=[], metavar='HOST[:PORT]')
+    cmd.add_argument('--discover', action='store_true', help='also poll every discovered device')
+    _add_discovery_args(cmd)
+    cmd.add_argument('--path', action='append', help=f'path to poll (default: {" ".join(DEFAULT_PATHS)})')
+    cmd.add_argument('--rounds', type=int, default=1, help='0 polls until interrupted')
+    cmd.add_argument('--interval', type=float, default=5.0, help='seconds between rounds')
+    cmd.add_argument('--max-in-flight', type=int, default=2, help='concurrent requests per device')
+    cmd.add_argument('--request-timeout', type=float, default=5.0)
+    cmd.add_argument('--output', default='fleet.jsonl')
+    cmd.set_defaults(run=_poll)
+
+    cmd = commands.add_parser('export', help="download a sensor's history")
+    cmd.add_argument('--device', required=True, metavar='HOST[:PORT]')
+    cmd.add_argument('--sensor', default='dht11')
+    cmd.add_argument('--format', choices=('json', 'cbor', 'packed'), default='packed')
+    cmd.add_argument('--request-timeout', type=float, default=10.0)
+    cmd.set_defaults(run=_export)
+
+    cmd = commands.add_parser('simulate', help='run simulated devices on localhost')
+    cmd.add_argument('--count', type=int, default=10)
+    cmd.add_argument('--base-port', type=int, default=8100)
+    cmd.add_argument('--latency', type=float, default=0.05)
+    cmd.add_argument('--close', action='store_true', help='close connections after every response')
+    cmd.add_argument('--discovery-port', type=int, default=DISCOVERY_PORT)
+    cmd.set_defaults(run=_simulate)
+
+    cmd = commands.add_parser('bench', help='compare serial and concurrent polling of simulated devices')
+    cmd.add_argument('--count', type=int, default=20)
+    cmd.add_argument('--latency', type=float, default=0.05)
+    cmd.add_argument('--rounds', type=int, default=3)
+    cmd.add_argument('--max-in-flight', type=int, default=2)
+    cmd.set_defaults(run=_bench)
+
+    args = parser.parse_args(argv)
+    try:
+        return asyncio.run(args.run(args)) or 0
+    except KeyboardInterrupt:
+        return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,52 @@
+"""
+            @project NetMaster_OS
+            @date 19-10-2026
+
+    Benchmark of fleet polling against simulated devices on localhost.
+
+    Compares the old way of polling, one request at a time with a new connection
+    for each (as `urllib` or `requests.get` scripts do), against `poll_fleet`.
+"""
+
+import asyncio
+import time
+import urllib.request
+
+from .collector import DEFAULT_PATHS, Device, poll_fleet
+from .simulator import start_fleet, stop_fleet
+
+
+def _serial_poll(devices, paths, rounds):
+    for _ in range(rounds):
+        for device in devices:
+            for path in paths:
+                with urllib.request.urlopen(f'http://{device.address}{path}', timeout=10) as response:
+                    response.read()
+
+
+async def run_bench(count=20, latency=0.05, rounds=3, max_in_flight=2, paths=DEFAULT_PATHS):
+    sims, _ = await start_fleet(count, latency=latency, discovery_port=0)
+    devices = [Device('127.0.0.1', sim.port, sim.name) for sim in sims]
+    requests = count * len(paths) * rounds
+    results = {}
+    try:
+        start = time.perf_counter()
+        await asyncio.to_thread(_serial_poll, devices, paths, rounds)
+        results['serial'] = time.perf_counter() - start
+        connections = sum(sim.connections for sim in sims)
+
+        start = time.perf_counter()
+        await poll_fleet(devices, paths, rounds=rounds, max_in_flight=max_in_flight)
+        results['concurrent'] = time.perf_counter() - start
+        pooled = sum(sim.connections for sim in sims) - connections
+    finally:
+        await stop_fleet(sims)
+
+    print(f'{count} devices, {len(paths)} paths, {rounds} rounds, '
+          f'{latency * 1000:.0f} ms device latency: {requests} requests each')
+    print(f'  serial     : {results["serial"]:.2f} s, {requests / results["serial"]:.0f} req/s, '
+          f'{connections} connections')
+    print(f'  concurrent : {results["concurrent"]:.2f} s, {requests / results["concurrent"]:.0f} req/s, '
+          f'{pooled} connections')
+    print(f'  speedup    : {results["serial"] / results["concurrent"]:.1f}x')
+    return results
@@ -0,0 +1,129 @@
+"""
+            @project NetMaster_OS
+            @date 19-10-2026
+
+    Minimal asyncio HTTP/1.1 client for NetMaster_OS devices.
+
+    A `DeviceClient` talks to one device. It keeps idle keep-alive connections
+    for reuse and lets at most `max_in_flight` requests run against the device at
+    once, which bounds the number of open connections as well: the ESP32 web server
+    only serves one client at a time. Responses without a `Content-Length` (the
+    current firmware closes the connection after every response) are read to EOF
+    and their connection is not reused.
+"""
+
+import asyncio
+
+
+class HTTPError(ValueError):
+    """The peer did not answer with a usable HTTP response."""
+
+
+async def _read_response(reader):
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError('connection closed before the response')
+    parts = status_line.decode('latin-1').split(None, 2)
+    if len(parts) < 2 or not parts[0].startswith('HTTP/'):
+        raise HTTPError(f'bad status line: {status_line!r}')
+    status = int(parts[1])
+    keep_alive = parts[0] == 'HTTP/1.1'
+
+    length = None
+    chunked = False
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        name = name.strip().lower()
+        value = value.strip()
+        if name == 'content-length':
+            length = int(value)
+        elif name == 'transfer-encoding' and 'chunked' in value.lower():
+            chunked = True
+        elif name == 'connection':
+            keep_alive = value.lower() == 'keep-alive' or (keep_alive and value.lower() != 'close')
+
+    if chunked:
+        body = bytearray()
+        while True:
+            size = int((await reader.readline()).split(b';')[0], 16)
+            if size == 0:
+                await reader.readline()
+                break
+            body += await reader.readexactly(size)
+            await reader.readline()
+        body = bytes(body)
+    elif length is not None:
+        body = await reader.readexactly(length)
+    else:
+        body = await reader.read()
+        keep_alive = False
+    return status, body, keep_alive
+
+
+class DeviceClient:
+    def __init__(self, host, port=80, max_in_flight=2, timeout=5.0):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.requests = 0
+        self.connections = 0   # Connections opened so far
+        self._idle = []
+        self._slots = asyncio.Semaphore(max_in_flight)
+
+    async def _connect(self):
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port), self.timeout)
+        self.connections += 1
+        return reader, writer
+
+    async def _exchange(self, conn, path):
+        reader, writer = conn
+        writer.write(
+            f'GET {path} HTTP/1.1\r\nHost: {self.host}\r\nConnection: keep-alive\r\n\r\n'.encode())
+        await writer.drain()
+        return await asyncio.wait_for(_read_response(reader), self.timeout)
+
+    async def get(self, path):
+        """Return `(status, body)` of `GET path`."""
+        async with self._slots:
+            self.requests += 1
+            conn = None
+            while self._idle:
+                conn = self._idle.pop()
+                if not conn[1].is_closing():
+                    break
+                conn = None
+            if conn is not None:
+                try:
+                    status, body, keep_alive = await self._exchange(conn, path)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    # The device dropped the idle connection; retry once on a new one
+                    conn[1].close()
+                    conn = None
+                except BaseException:
+                    conn[1].close()
+                    raise
+            if conn is None:
+                conn = await self._connect()
+                try:
+                    status, body, keep_alive = await self._exchange(conn, path)
+                except BaseException:
+                    conn[1].close()
+                    raise
+            if keep_alive:
+                self._idle.append(conn)
+            else:
+                conn[1].close()
+            return status, body
+
+    async def close(self):
+        while self._idle:
+            writer = self._idle.pop()[1]
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
@@ -0,0 +1,80 @@
+"""
+            @project NetMaster_OS
+            @date 19-10-2026
+
+    Concurrent fleet polling.
+
+    Every round requests each path from every device at the same time, one
+    `DeviceClient` per device, and appends the results to a `TimeSeriesWriter`.
+"""
+
+import asyncio
+import json
+import time
+from dataclasses import dataclass
+
+from .client import DeviceClient
+
+DEFAULT_PATHS = ('/dht11', '/cmd/wifi?scan')
+
+
+@dataclass(frozen=True)
+class Device:
+    host: str
+    port: int = 80
+    name: str = ''
+
+    @property
+    def address(self):
+        return f'{self.host}:{self.port}'
+
+    @classmethod
+    def parse(cls, text):
+        """Build a device from `host` or `host:port`."""
+        host, _, port = text.partition(':')
+        return cls(host, int(port) if port else 80)
+
+
+async def _poll_one(client, device, path):
+    record = {'ts': time.time(), 'device': device.address, 'name': device.name, 'path': path}
+    start = time.perf_counter()
+    try:
+        status, body = await client.get(path)
+    except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError) as e:
+        record['status'] = None
+        record['error'] = str(e) or type(e).__name__
+        return record
+    record['status'] = status
+    record['latency_ms'] = round((time.perf_counter() - start) * 1000, 2)
+    text = body.decode('utf-8', 'replace')
+    try:
+        record['data'] = json.loads(text)
+    except ValueError:
+        record['data'] = text
+    return record
+
+
+async def poll_fleet(devices, paths=DEFAULT_PATHS, rounds=1, interval=0.0,
+                     writer=None, max_in_flight=2, timeout=5.0):
+    """Poll `paths` on every device for `rounds` rounds, `interval` seconds apart.
+
+    Returns the records of the last round. `rounds=0` polls until cancelled.
+    """
+    clients = {device: DeviceClient(device.host, device.port, max_in_flight, timeout)
+               for device in devices}
+    records = []
+    done = 0
+    try:
+        while not rounds or done < rounds:
+            started = time.monotonic()
+            records = await asyncio.gather(*(
+                _poll_one(clients[device], device, path)
+                for device in devices for path in paths))
+            if writer is not None:
+                writer.write_many(records)
+            done += 1
+            if not rounds or done < rounds:
+                await asyncio.sleep(max(0.0, interval - (time.monotonic() - started)))
+    finally:
+        await asyncio.gather(*(client.close() for client in clients.values()))
+    return records
@@ -0,0 +1,46 @@
+"""
+            @project NetMaster_OS
+            @date 19-10-2026
+
+    Find NetMaster_OS devices with the UDP broadcast answered by `src/discovery.py`.
+"""
+
+import asyncio
+import json
+import socket
+
+DISCOVERY_PORT = 50505
+DISCOVERY_MESSAGE = b'NETMASTER_DISCOVER'
+
+
+class _DiscoveryProtocol(asyncio.DatagramProtocol):
+    def __init__(self):
+        self.found = {}
+
+    def datagram_received(self, data, addr):
+        # Anything on the port may answer; ignore replies that are not a device's
+        try:
+            info = json.loads(data)
+            port = int(info.get('port', 80))
+        except (ValueError, TypeError, AttributeError):
+            return
+        host = addr[0]
+        self.found[(host, port)] = {
+            'host': host,
+            'port': port,
+            'name': info.get('name', ''),
+            'id': info.get('id', ''),
+        }
+
+
+async def discover(address='255.255.255.255', port=DISCOVERY_PORT, timeout=2.0):
+    """Broadcast a discovery request and return the replies received within `timeout`."""
+    loop = asyncio.get_running_loop()
+    transport, protocol = await loop.create_datagram_endpoint(
+        _DiscoveryProtocol, local_addr=('0.0.0.0', 0), allow_broadcast=True, family=socket.AF_INET)
+    try:
+        transport.sendto(DISCOVERY_MESSAGE, (address, port))
+        await asyncio.sleep(timeout)
+    finally:
+        transport.close()
+    return sorted(protocol.found.values(), key=lambda d: (d['host'], d['port']))
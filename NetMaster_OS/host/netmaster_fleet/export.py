@@ -0,0 +1,128 @@
+"""
+            @project NetMaster_OS
+            @date 19-10-2026
+
+    Decoders for the binary history exports of `src/sensor_export.py`.
+
+    Both decoders return the same shape as the JSON export:
+
+        {"sensor": name, "fields": [names], "samples": [[ts, value, ...], ...]}
+"""
+
+import struct
+import sys
+from array import array
+
+JSON = 'application/json'
+CBOR = 'application/cbor'
+PACKED = 'application/x-netmaster-packed'
+
+TAG_INT32_LE = 78
+TAG_FLOAT32_LE = 85
+
+
+def _column(data, typecode):
+    col = array(typecode)
+    col.frombytes(data)
+    if sys.byteorder == 'big':
+        col.byteswap()
+    return col
+
+def _rows(ts, cols):
+    return [[ts[i]] + [col[i] for col in cols] for i in range(len(ts))]
+
+
+def decode_packed(data):
+    if data[:3] != b'NMX':
+        raise ValueError('not a NetMaster_OS packed export')
+    version, nfields, ts_size, value_size, _, count = struct.unpack_from('<BBBBBI', data, 3)
+    if version != 1 or ts_size != 4 or value_size != 4:
+        raise ValueError(f'unsupported packed export (version {version})')
+    pos = 12
+    names = []
+    for _ in range(nfields + 1):
+        n = data[pos]
+        names.append(bytes(data[pos + 1:pos + 1 + n]).decode())
+        pos += n + 1
+    ts = _column(data[pos:pos + 4 * count], 'i')
+    pos += 4 * count
+    cols = []
+    for _ in range(nfields):
+        cols.append(_column(data[pos:pos + 4 * count], 'f'))
+        pos += 4 * count
+    return {'sensor': names[0], 'fields': names[1:], 'samples': _rows(ts, cols)}
+
+
+def _cbor_item(data, pos):
+    """Decode the CBOR item at `pos`; return `(value, next position)`."""
+    head = data[pos]
+    major, info = head >> 5, head & 0x1f
+    pos += 1
+    if info < 24:
+        n = info
+    elif info == 24:
+        n = data[pos]
+        pos += 1
+    elif info == 25:
+        n = struct.unpack_from('>H', data, pos)[0]
+        pos += 2
+    elif info == 26:
+        n = struct.unpack_from('>I', data, pos)[0]
+        pos += 4
+    elif info == 27:
+        n = struct.unpack_from('>Q', data, pos)[0]
+        pos += 8
+    else:
+        raise ValueError('indefinite-length CBOR items are not supported')
+
+    if major == 0:
+        return n, pos
+    if major == 1:
+        return -1 - n, pos
+    if major == 2:
+        return bytes(data[pos:pos + n]), pos + n
+    if major == 3:
+        return bytes(data[pos:pos + n]).decode(), pos + n
+    if major == 4:
+        items = []
+        for _ in range(n):
+            item, pos = _cbor_item(data, pos)
+            items.append(item)
+        return items, pos
+    if major == 5:
+        items = {}
+        for _ in range(n):
+            key, pos = _cbor_item(data, pos)
+            items[key], pos = _cbor_item(data, pos)
+        return items, pos
+    if major == 6:
+        item, pos = _cbor_item(data, pos)
+        if n == TAG_INT32_LE:
+            return _column(item, 'i'), pos
+        if n == TAG_FLOAT32_LE:
+            return _column(item, 'f'), pos
+        return item, pos
+    if major == 7 and info == 26:
+        return struct.unpack('>f', struct.pack('>I', n))[0], pos
+    if major == 7 and info == 27:
+        return struct.unpack('>d', struct.pack('>Q', n))[0], pos
+    if major == 7:
+        return {20: False, 21: True, 22: None}.get(n), pos
+    raise ValueError(f'unsupported CBOR major type {major}')
+
+
+def decode_cbor(data):
+    doc, _ = _cbor_item(memoryview(data), 0)
+    return {'sensor': doc['sensor'], 'fields': doc['fields'], 'samples': _rows(doc['t'], doc['values'])}
+
+
+def decode(data, content_type):
+    """Decode an export body by its Content-Type; a malformed body raises ValueError."""
+    try:
+        if content_type.startswith(PACKED):
+            return decode_packed(memoryview(data))
+        if content_type.startswith(CBOR):
+            return decode_cbor(data)
+    except (IndexError, KeyError, TypeError, struct.error) as e:
+        raise ValueError(f'truncated or malformed export: {e}') from e
+    raise ValueError(f'not a binary export: {content_type}')
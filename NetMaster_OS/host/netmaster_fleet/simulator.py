@@ -0,0 +1,122 @@
+"""
+            @project NetMaster_OS
+            @date 19-10-2026
+
+    Simulated NetMaster_OS devices on localhost.
+
+    Each `SimulatedDevice` is an HTTP server on its own port answering `/dht11`,
+    `/cmd/wifi?scan` and `/sensors` with the same JSON shapes as the firmware, after
+    `latency` seconds to stand in for the ESP32 and WiFi. Like the ESP32 it serves
+    one request at a time. `keep_alive=False` closes the connection after every
+    response, as the current firmware does. A `DiscoveryResponder` answers discovery
+    broadcasts on behalf of all of them.
+"""
+
+import asyncio
+import json
+import random
+
+from .discovery import DISCOVERY_MESSAGE, DISCOVERY_PORT
+
+
+class SimulatedDevice:
+    def __init__(self, name, port, latency=0.05, keep_alive=True):
+        self.name = name
+        self.port = port
+        self.latency = latency
+        self.keep_alive = keep_alive
+        self.requests = 0
+        self.connections = 0
+        self._busy = asyncio.Lock()
+        self._server = None
+
+    def _body(self, path):
+        if path == '/dht11':
+            return 200, {'temperature': random.randint(20, 30), 'humidity': random.randint(35, 60)}
+        if path.startswith('/cmd/wifi') and 'scan' in path:
+            return 200, [{'ssid': f'net-{i}', 'rssi': -40 - 7 * i, 'security': 'WPA2-PSK'}
+                         for i in range(5)]
+        if path == '/sensors':
+            return 200, {'dht11': {'driver': 'dht11', 'values': {'temperature': 25, 'humidity': 40}}}
+        return 404, {'error': 'not found'}
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                    pass
+                parts = request_line.decode('latin-1').split()
+                path = parts[1] if len(parts) > 1 else '/'
+                async with self._busy:
+                    await asyncio.sleep(self.latency)
+                    self.requests += 1
+                    status, data = self._body(path)
+                body = json.dumps(data).encode()
+                head = (f'HTTP/1.1 {status} {"OK" if status == 200 else "Not Found"}\r\n'
+                        'Content-Type: application/json\r\n')
+                if self.keep_alive:
+                    head += f'Content-Length: {len(body)}\r\nConnection: keep-alive\r\n\r\n'
+                else:
+                    head += 'Connection: close\r\n\r\n'
+                writer.write(head.encode() + body)
+                await writer.drain()
+                if not self.keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host='127.0.0.1'):
+        self._server = await asyncio.start_server(self._handle, host, self.port)
+        if not self.port:
+            self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+
+class DiscoveryResponder(asyncio.DatagramProtocol):
+    """Answers a discovery broadcast once for every simulated device."""
+
+    def __init__(self, devices):
+        self.devices = devices
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        if data.strip() != DISCOVERY_MESSAGE:
+            return
+        for i, device in enumerate(self.devices):
+            reply = {'name': device.name, 'id': f'sim{i:04d}', 'port': device.port}
+            self.transport.sendto(json.dumps(reply).encode(), addr)
+
+
+async def start_fleet(count, base_port=0, latency=0.05, keep_alive=True,
+                      discovery_port=DISCOVERY_PORT, host='127.0.0.1'):
+    """Start `count` simulated devices; return them and the discovery transport (or None)."""
+    devices = []
+    for i in range(count):
+        port = base_port + i if base_port else 0
+        devices.append(await SimulatedDevice(f'sim-{i}', port, latency, keep_alive).start(host))
+    transport = None
+    if discovery_port:
+        loop = asyncio.get_running_loop()
+        transport, _ = await loop.create_datagram_endpoint(
+            lambda: DiscoveryResponder(devices), local_addr=(host, discovery_port))
+    return devices, transport
+
+
+async def stop_fleet(devices, transport=None):
+    if transport is not None:
+        transport.close()
+    await asyncio.gather(*(device.stop() for device in devices))
@@ -0,0 +1,43 @@
+"""
+            @project NetMaster_OS
+            @date 19-10-2026
+
+    Local time-series file for fleet results.
+
+    Records are appended as JSON lines, one per request:
+
+        {"ts": 1729300000.12, "device": "192.168.1.7:80", "name": "...",
+         "path": "/dht11", "status": 200, "latency_ms": 31.2, "data": {...}}
+
+    Failed requests have `"status": null` and an `"error"` message instead of data.
+"""
+
+import json
+
+
+class TimeSeriesWriter:
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def write_many(self, records):
+        for record in records:
+            self._file.write(json.dumps(record, separators=(',', ':')))
+            self._file.write('\n')
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_records(path):
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
@@ -0,0 +1,57 @@
+import binascii
+import json
+import os
+import sys
+import time
+import types
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, os.path.join(HERE, '..', '..', 'src'))
+
+# The firmware modules in src/ import MicroPython modules at the top. Stand in for
+# them, so their pure logic (scheduler, statistics, config store) runs on CPython.
+sys.modules.setdefault('ujson', json)
+sys.modules.setdefault('ubinascii', binascii)
+sys.modules.setdefault('uos', os)
+
+
+def _stub(name, **attrs):
+    module = types.ModuleType(name)
+    module.__dict__.update(attrs)
+    sys.modules.setdefault(name, module)
+
+
+class _Pin:
+    IN, OUT = 0, 1
+
+    def __init__(self, id, *args):
+        self.id = id
+
+
+class _ADC:
+    def __init__(self, pin):
+        self.pin = pin
+
+    def read(self):
+        return 0
+
+
+class _DHT:
+    def __init__(self, pin):
+        self.pin = pin
+
+    def measure(self):
+        raise OSError('no DHT sensor on CPython')
+
+
+_stub('machine', Pin=_Pin, ADC=_ADC, unique_id=lambda: b'\x00\x01')
+_stub('dht', DHT11=_DHT, DHT22=_DHT)
+
+# MicroPython's tick helpers; plain integers are enough without wraparound
+if not hasattr(time, 'ticks_ms'):
+    time.ticks_ms = lambda: int(time.monotonic() * 1000)
+    time.ticks_us = lambda: int(time.monotonic() * 1000000)
+    time.ticks_add = lambda ticks, delta: ticks + delta
+    time.ticks_diff = lambda new, old: new - old
+    time.sleep_ms = lambda ms: time.sleep(ms / 1000)
@@ -0,0 +1,128 @@
+import json
+import os
+import types
+
+import pytest
+
+import config_store
+
+
+@pytest.fixture
+def path(tmp_path):
+    config_store._cache.clear()
+    yield str(tmp_path / 'config.json')
+    config_store._cache.clear()
+
+
+@pytest.mark.parametrize('key, value', [
+    ('gpio_led', 5),
+    ('gpio_led', 0),
+    ('gpio_led', 39),
+    ('ip_addr', '10.0.0.254'),
+    ('ssid', 'x' * 32),
+    ('device_name', 'Kitchen'),
+])
+def test_check_accepts_usable_values(key, value):
+    assert config_store.check(key, value, config_store.DEFAULTS[key]) is None
+
+
+@pytest.mark.parametrize('key, value', [
+    ('gpio_led', 40),
+    ('gpio_led', -1),
+    ('gpio_led', '5'),
+    ('gpio_led', True),
+    ('gpio_led', 2.5),
+    ('ip_addr', '1.2.3'),
+    ('ip_addr', '1.2.3.256'),
+    ('ip_addr', 'a.b.c.d'),
+    ('ip_addr', 7),
+    ('ssid', 'x' * 33),
+    ('ssid', ['a']),
+    ('password', {'a': 1}),
+])
+def test_check_refuses_unusable_values(key, value):
+    assert config_store.check(key, value, config_store.DEFAULTS[key])
+
+
+def test_missing_file_loads_the_defaults(path):
+    values = config_store.load({'device_name': 'App'}, path)
+    assert values == dict(config_store.DEFAULTS, device_name='App')
+    assert config_store.get('gpio_led') == 2
+
+
+@pytest.mark.parametrize('data', ['', '{"ssid": "ab', '[1, 2]', 'null'])
+def test_unreadable_file_loads_the_defaults(path, data):
+    with open(path, 'w') as f:
+        f.write(data)
+    assert config_store.load(None, path) == config_store.DEFAULTS
+
+
+def test_bad_stored_values_fall_back_per_key(path):
+    with open(path, 'w') as f:
+        json.dump({'gpio_led': 99, 'ssid': 5, 'ip_addr': '10.0.0.9', 'extra': [1]}, f)
+    values = config_store.load(None, path)
+    assert values['gpio_led'] == config_store.DEFAULTS['gpio_led']
+    assert values['ssid'] == config_store.DEFAULTS['ssid']
+    assert values['ip_addr'] == '10.0.0.9'
+    assert values['extra'] == [1]
+
+
+def test_leftover_temporary_file_is_used(path):
+    with open(path, 'w') as f:
+        f.write('{"ssid": "tr')
+    with open(path + '.tmp', 'w') as f:
+        json.dump({'ssid': 'Home'}, f)
+    assert config_store.load(None, path)['ssid'] == 'Home'
+
+
+def test_save_writes_compact_json_and_renames(path):
+    config_store.save({'ssid': 'Home', 'gpio_led': 5}, path)
+    with open(path) as f:
+        assert f.read() == '{"ssid":"Home","gpio_led":5}'
+    config_store.save({'ssid': 'Work'}, path)
+    assert config_store._read(path) == {'ssid': 'Work'}
+    assert not os.path.exists(path + '.tmp')
+
+
+def test_save_replaces_when_rename_cannot_overwrite(path, monkeypatch):
+    def rename(src, dst):
+        if os.path.exists(dst):
+            raise OSError('EEXIST')
+        os.rename(src, dst)
+    monkeypatch.setattr(config_store, 'uos', types.SimpleNamespace(rename=rename, remove=os.remove))
+    config_store.save({'ssid': 'Home'}, path)
+    config_store.save({'ssid': 'Work'}, path)
+    assert config_store._read(path) == {'ssid': 'Work'}
+
+
+def test_update_validates_saves_and_caches(path):
+    config_store.load(None, path)
+    assert config_store.update({'gpio_led': 5, 'ip_addr': '10.0.0.2'}, path) is None
+    assert config_store.get('gpio_led') == 5
+    assert config_store._read(path)['ip_addr'] == '10.0.0.2'
+    assert config_store.load(None, path)['gpio_led'] == 5
+
+
+@pytest.mark.parametrize('changes', [
+    {'nope': 1},
+    {'gpio_led': 50},
+    {'ssid': 'ok', 'subnet': '255.255.255'},
+])
+def test_update_refuses_without_saving(path, changes):
+    config_store.load(None, path)
+    assert config_store.update(changes, path)
+    assert not os.path.exists(path)
+    assert config_store.get('ssid') == config_store.DEFAULTS['ssid']
+
+
+def test_failed_save_keeps_the_cache(path):
+    config_store.load(None, path)
+    missing_dir = os.path.join(os.path.dirname(path), 'missing', 'config.json')
+    assert config_store.update({'gpio_led': 5}, missing_dir).startswith('Failed to save config')
+    assert config_store.get('gpio_led') == 2
+
+
+def test_public_hides_the_password(path):
+    config_store.load(None, path)
+    assert 'password' not in config_store.public()
+    assert config_store.public()['ssid'] == config_store.DEFAULTS['ssid']
@@ -0,0 +1,156 @@
+import json
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+import sensor_export
+from netmaster_fleet import export
+from netmaster_fleet.__main__ import main
+from sensor_handler import History
+
+
+class Socket(bytearray):
+    def sendall(self, data):
+        self.extend(bytes(data))
+
+
+def history(samples, size=8):
+    hist = History(('temperature', 'humidity'), size)
+    for i in range(samples):
+        hist.append(1000 + i, (20.5 + i, 40.25 + i))
+    return hist
+
+
+def expected(samples, size=8):
+    # Worked out from what was appended, not from the ring buffer under test
+    return {
+        'sensor': 'dht11',
+        'fields': ['temperature', 'humidity'],
+        'samples': [[1000 + i, 20.5 + i, 40.25 + i] for i in range(max(samples - size, 0), samples)],
+    }
+
+
+def respond(hist, content_type):
+    cl = Socket()
+    sensor_export.send(cl, 'dht11', hist, content_type)
+    head, _, body = bytes(cl).partition(b'\r\n\r\n')
+    headers = dict(line.split(': ', 1) for line in head.decode().split('\r\n')[1:])
+    return headers, body
+
+
+@pytest.mark.parametrize('content_type', [export.PACKED, export.CBOR])
+@pytest.mark.parametrize('samples', [0, 1, 5, 13])
+def test_round_trip(content_type, samples):
+    hist = history(samples)
+    headers, body = respond(hist, content_type)
+    assert headers['Content-Type'] == content_type
+    assert int(headers['Content-Length']) == len(body)
+    assert export.decode(body, content_type) == expected(samples)
+
+
+def test_wrapped_history_is_oldest_first():
+    hist = history(13)
+    _, body = respond(hist, export.PACKED)
+    samples = export.decode(body, export.PACKED)['samples']
+    assert [row[0] for row in samples] == list(range(1005, 1013))
+
+
+@pytest.mark.parametrize('content_type', [export.PACKED, export.CBOR])
+def test_samples_taken_while_sending_do_not_tear_the_export(content_type):
+    hist = history(13)
+
+    class Busy(Socket):
+        def sendall(self, data):
+            super().sendall(data)
+            i = hist.ts[(hist.head - 1) % hist.size] - 1000 + 1
+            hist.append(1000 + i, (20.5 + i, 40.25 + i))  # The scheduler thread
+
+    cl = Busy()
+    sensor_export.send(cl, 'dht11', hist, content_type)
+    head, _, body = bytes(cl).partition(b'\r\n\r\n')
+    assert int(head.split(b'Content-Length: ')[1]) == len(body)
+    assert export.decode(body, content_type) == expected(13)
+
+
+def test_packed_length_matches_layout():
+    hist = history(5)
+    _, body = respond(hist, export.PACKED)
+    names = (1 + len('dht11')) + (1 + len('temperature')) + (1 + len('humidity'))
+    assert len(body) == 12 + names + 4 * 5 * 3
+
+
+def test_rejects_other_formats():
+    with pytest.raises(ValueError):
+        export.decode_packed(b'XYZ' + bytes(9))
+    with pytest.raises(ValueError):
+        export.decode(b'{}', export.JSON)
+
+
+def test_negotiate():
+    assert sensor_export.negotiate('application/cbor') == export.CBOR
+    assert sensor_export.negotiate('*/*', 'format=packed') == export.PACKED
+    assert sensor_export.negotiate('text/html') == export.JSON
+
+
+@pytest.mark.parametrize('content_type', [export.PACKED, export.CBOR])
+def test_truncated_body_raises_value_error(content_type):
+    _, body = respond(history(5), content_type)
+    for size in (len(body) // 2, 20, 3):
+        with pytest.raises(ValueError):
+            export.decode(body[:size], content_type)
+
+
+@pytest.fixture
+def device():
+    """A device answering every request with the body and status set on it."""
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(server.status)
+            self.send_header('Content-Length', str(len(server.body)))
+            self.end_headers()
+            self.wfile.write(server.body)
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(('127.0.0.1', 0), Handler)
+    server.status = 200
+    server.body = b''
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def export_cli(port, capsys, *args):
+    code = main(['export', '--device', f'127.0.0.1:{port}', '--request-timeout', '2', *args])
+    return code, capsys.readouterr()
+
+
+def test_cli_exports_a_device_history(device, capsys):
+    _, device.body = respond(history(3), export.PACKED)
+    code, out = export_cli(device.server_port, capsys)
+    assert code == 0
+    assert json.loads(out.out) == expected(3)
+    assert '3 samples' in out.err
+
+
+@pytest.mark.parametrize('body, fmt', [(b'NMX\x01', 'packed'), (b'\xa4', 'cbor'), (b'{', 'json')])
+def test_cli_reports_a_malformed_body(device, capsys, body, fmt):
+    device.body = body
+    code, out = export_cli(device.server_port, capsys, '--format', fmt)
+    assert code == 1
+    assert out.out == ''
+    assert 'Traceback' not in out.err and out.err.startswith('127.0.0.1:')
+
+
+def test_cli_reports_an_unreachable_device(capsys):
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        port = s.getsockname()[1]
+    code, out = export_cli(port, capsys)
+    assert code == 1
+    assert out.err.startswith(f'127.0.0.1:{port}: ')
@@ -0,0 +1,162 @@
+import asyncio
+import socket
+
+import pytest
+
+from netmaster_fleet.client import DeviceClient, HTTPError
+from netmaster_fleet.collector import Device, poll_fleet
+from netmaster_fleet.discovery import _DiscoveryProtocol, discover
+from netmaster_fleet.simulator import start_fleet, stop_fleet
+from netmaster_fleet.store import TimeSeriesWriter, read_records
+
+
+def free_udp_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_keep_alive_connections_are_reused():
+    async def scenario():
+        sims, _ = await start_fleet(2, latency=0, discovery_port=0)
+        try:
+            devices = [Device('127.0.0.1', sim.port, sim.name) for sim in sims]
+            records = await poll_fleet(devices, ['/dht11'], rounds=3, max_in_flight=1)
+            return records, [sim.connections for sim in sims], [sim.requests for sim in sims]
+        finally:
+            await stop_fleet(sims)
+
+    records, connections, requests = run(scenario())
+    assert [r['status'] for r in records] == [200, 200]
+    assert set(records[0]['data']) == {'temperature', 'humidity'}
+    assert connections == [1, 1]
+    assert requests == [3, 3]
+
+
+def test_responses_without_length_are_read_to_eof():
+    async def scenario():
+        sims, _ = await start_fleet(1, latency=0, keep_alive=False, discovery_port=0)
+        client = DeviceClient('127.0.0.1', sims[0].port)
+        try:
+            results = [await client.get('/cmd/wifi?scan') for _ in range(3)]
+            return results, client, sims[0].connections
+        finally:
+            await client.close()
+            await stop_fleet(sims)
+
+    results, client, connections = run(scenario())
+    assert all(status == 200 and body.startswith(b'[') for status, body in results)
+    assert client.connections == connections == 3
+    assert not client._idle
+
+
+def test_in_flight_requests_are_capped_per_device():
+    async def scenario():
+        sims, _ = await start_fleet(1, latency=0.02, discovery_port=0)
+        client = DeviceClient('127.0.0.1', sims[0].port, max_in_flight=2)
+        try:
+            await asyncio.gather(*(client.get('/dht11') for _ in range(8)))
+            return client.connections, sims[0].connections, sims[0].requests
+        finally:
+            await client.close()
+            await stop_fleet(sims)
+
+    opened, accepted, requests = run(scenario())
+    assert opened == accepted == 2
+    assert requests == 8
+
+
+def test_non_http_peer_becomes_an_error_record(tmp_path):
+    async def banner(reader, writer):
+        writer.write(b'SSH-2.0-OpenSSH_9.6\r\n')
+        await writer.drain()
+        writer.close()
+
+    async def scenario():
+        sims, _ = await start_fleet(3, latency=0, discovery_port=0)
+        bad = await asyncio.start_server(banner, '127.0.0.1', 0)
+        devices = [Device('127.0.0.1', sim.port, sim.name) for sim in sims]
+        devices.append(Device('127.0.0.1', bad.sockets[0].getsockname()[1], 'ssh'))
+        try:
+            with TimeSeriesWriter(tmp_path / 'fleet.jsonl') as writer:
+                return await poll_fleet(devices, ['/dht11'], writer=writer)
+        finally:
+            bad.close()
+            await stop_fleet(sims)
+
+    records = run(scenario())
+    assert [r['status'] for r in records] == [200, 200, 200, None]
+    assert 'bad status line' in records[3]['error']
+    stored = list(read_records(tmp_path / 'fleet.jsonl'))
+    assert [r['device'] for r in stored] == [r['device'] for r in records]
+
+
+def test_failed_reused_connection_is_closed():
+    async def answer_once(reader, writer):
+        await reader.readline()
+        while (await reader.readline()) not in (b'\r\n', b''):
+            pass
+        writer.write(b'HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\n{}')
+        await writer.drain()
+        await asyncio.sleep(1)  # Never answer the second request
+        writer.close()
+
+    async def scenario():
+        server = await asyncio.start_server(answer_once, '127.0.0.1', 0)
+        client = DeviceClient('127.0.0.1', server.sockets[0].getsockname()[1], timeout=0.2)
+        try:
+            assert await client.get('/') == (200, b'{}')
+            conn = client._idle[0]
+            with pytest.raises(asyncio.TimeoutError):
+                await client.get('/')
+            return conn, client._idle
+        finally:
+            await client.close()
+            server.close()
+
+    conn, idle = run(scenario())
+    assert conn[1].is_closing()
+    assert idle == []
+
+
+def test_http_error_is_a_value_error():
+    assert issubclass(HTTPError, ValueError)
+
+
+def test_discover_finds_simulated_devices():
+    async def scenario():
+        port = free_udp_port()
+        sims, transport = await start_fleet(3, latency=0, discovery_port=port)
+        try:
+            return sims, await discover('127.0.0.1', port, timeout=0.3)
+        finally:
+            await stop_fleet(sims, transport)
+
+    sims, found = run(scenario())
+    assert [(d['host'], d['port'], d['name']) for d in found] == \
+        sorted(('127.0.0.1', sim.port, sim.name) for sim in sims)
+
+
+def test_discovery_ignores_malformed_replies():
+    protocol = _DiscoveryProtocol()
+    for data in (b'not json', b'[1]', b'"text"', b'{"port": "http"}', b'{"port": null}'):
+        protocol.datagram_received(data, ('10.0.0.2', 50505))
+    protocol.datagram_received(b'{"name": "a", "id": "01"}', ('10.0.0.3', 50505))
+    assert list(protocol.found.values()) == [
+        {'host': '10.0.0.3', 'port': 80, 'name': 'a', 'id': '01'}]
+
+
+def test_time_series_writer_appends(tmp_path):
+    path = tmp_path / 'fleet.jsonl'
+    with TimeSeriesWriter(path) as writer:
+        writer.write_many([{'device': 'a', 'status': 200}])
+    with TimeSeriesWriter(path) as writer:
+        writer.write_many([{'device': 'b', 'status': None, 'error': 'x'}])
+    assert list(read_records(path)) == [
+        {'device': 'a', 'status': 200},
+        {'device': 'b', 'status': None, 'error': 'x'},
+    ]
@@ -0,0 +1,182 @@
+import json
+
+import pytest
+
+import sensor_handler
+
+
+class FakeDriver(sensor_handler.Driver):
+    """Driver whose bus, conversion time and failures are set from its config."""
+
+    fields = ('value',)
+    min_interval = 100
+    starts = []
+
+    def __init__(self, cfg):
+        super().__init__(cfg)
+        self.wait = cfg.get('wait', 0)
+        self.fail = False
+        self.reads = 0
+        self.next_due = 0
+
+    def bus_key(self, cfg):
+        return ('fake', cfg.get('bus', cfg['name']))
+
+    def start(self, group):
+        FakeDriver.starts.append([drv.name for drv in group])
+        return self.wait
+
+    def read(self):
+        if self.fail:
+            raise OSError('ETIMEDOUT')
+        self.reads += 1
+        return (float(self.reads),)
+
+
+@pytest.fixture(autouse=True)
+def scheduler():
+    sensor_handler.register_driver('fake', FakeDriver)
+    state = (sensor_handler.drivers, sensor_handler.latest, sensor_handler.history,
+             sensor_handler.listeners, sensor_handler._pending, sensor_handler._buses)
+    for item in state:
+        item.clear()
+    FakeDriver.starts = []
+    yield
+    for item in state:
+        item.clear()
+
+
+def add(name, interval=1000, **cfg):
+    return sensor_handler.add_sensor(dict(cfg, name=name, driver='fake', interval=interval))
+
+
+def test_driver_is_sampled_at_its_interval():
+    drv = add('a')
+    for now in (0, 500, 999, 1000, 1500, 2000):
+        sensor_handler.tick(now)
+    assert drv.reads == 3
+    assert drv.next_due == 3000
+    assert sensor_handler.history['a'].count == 3
+    assert sensor_handler.read('a') == {'value': 3.0}
+
+
+def test_drivers_on_one_bus_share_a_conversion():
+    a = add('a', 5000, bus=1, wait=750)
+    b = add('b', 5000, bus=1, wait=750)
+    sensor_handler.tick(0)
+    assert FakeDriver.starts == [['a', 'b']]
+    assert a.busy and b.busy
+    sensor_handler.tick(500)
+    assert a.reads == b.reads == 0
+    sensor_handler.tick(750)
+    assert a.reads == b.reads == 1
+    assert not a.busy and not b.busy
+
+
+def test_conversion_wait_does_not_stretch_the_period():
+    drv = add('a', 5000, wait=750)
+    for now in range(0, 20751, 250):
+        sensor_handler.tick(now)
+    assert drv.next_due == 25000
+    assert len(FakeDriver.starts) == 5
+
+
+def test_driver_due_soon_joins_a_started_batch():
+    add('a', 5000, bus=1, wait=750)
+    b = add('b', 5000, bus=1, wait=750)
+    b.next_due = sensor_handler.BATCH_SLACK_MS - 50
+    sensor_handler.tick(0)
+    assert FakeDriver.starts == [['a', 'b']]
+
+
+def test_drivers_on_other_buses_are_not_batched():
+    add('a', bus=1)
+    add('b', bus=2)
+    sensor_handler.tick(0)
+    assert FakeDriver.starts == [['a'], ['b']]
+
+
+def test_failing_driver_backs_off_then_recovers():
+    drv = add('a', 1000)
+    drv.fail = True
+    delays = []
+    now = 0
+    for _ in range(8):
+        sensor_handler.tick(now)
+        delays.append(drv.next_due - now)
+        now = drv.next_due
+    assert delays == [2000, 4000, 8000, 16000, 32000, 60000, 60000, 60000]
+    drv.fail = False
+    sensor_handler.tick(now)
+    assert drv.fails == 0
+    assert drv.next_due - now == 1000
+
+
+def test_backoff_is_never_faster_than_the_interval():
+    drv = add('a', 2 * sensor_handler.MAX_BACKOFF_MS)
+    drv.fail = True
+    sensor_handler.tick(0)
+    assert drv.next_due == 2 * sensor_handler.MAX_BACKOFF_MS
+
+
+def test_failed_start_fails_the_whole_batch():
+    a = add('a', bus=1)
+    b = add('b', bus=1)
+
+    def broken(group):
+        raise OSError('bus error')
+    a.start = broken
+    sensor_handler.tick(0)
+    assert a.fails == b.fails == 1
+    assert not a.busy and not b.busy
+
+
+def test_next_delay_waits_for_the_earliest_work():
+    add('a', 5000, wait=750)
+    add('b', 1000, bus=2)
+    sensor_handler.tick(0)
+    assert sensor_handler.next_delay(0) == 750
+    sensor_handler.tick(750)
+    assert sensor_handler.next_delay(750) == 250
+
+
+def test_listeners_get_every_sample_and_cannot_stop_the_scheduler():
+    seen = []
+
+    def broken(*args):
+        raise RuntimeError('listener bug')
+    sensor_handler.subscribe(broken)
+    sensor_handler.subscribe(lambda name, fields, ts, values: seen.append((name, fields, values)))
+    drv = add('a')
+    sensor_handler.tick(0)
+    sensor_handler.tick(1000)
+    assert seen == [('a', ('value',), (1.0,)), ('a', ('value',), (2.0,))]
+    assert drv.fails == 0
+
+
+def test_unknown_driver_is_skipped():
+    assert sensor_handler.add_sensor({'name': 'x', 'driver': 'nope'}) is None
+    assert sensor_handler.drivers == []
+
+
+def test_config_entry_takes_missing_settings_from_the_default(tmp_path):
+    path = tmp_path / 'sensors.json'
+    path.write_text(json.dumps({'sensors': [{'name': 'dht11', 'driver': 'dht11', 'interval': 3000}]}))
+    (drv,) = sensor_handler.load_config(str(path), [{'name': 'dht11', 'driver': 'dht11', 'pin': 4}])
+    assert drv.dev.pin.id == 4
+    assert drv.interval == 3000
+
+
+def test_missing_config_uses_the_default(tmp_path):
+    drivers = sensor_handler.load_config(str(tmp_path / 'none.json'),
+                                         [{'name': 'dht11', 'driver': 'dht11', 'pin': 5}])
+    assert [drv.name for drv in drivers] == ['dht11']
+
+
+def test_history_wraps_oldest_first():
+    hist = sensor_handler.History(('value',), size=4)
+    for i in range(6):
+        hist.append(i, (float(i),))
+    assert hist.spans() == ((2, 4), (0, 2))
+    assert [ts for ts, _ in hist.rows()] == [2, 3, 4, 5]
+    assert sensor_handler.history_json('missing') is None
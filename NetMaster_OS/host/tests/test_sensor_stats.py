@@ -0,0 +1,195 @@
+import json
+import time
+
+import pytest
+
+import sensor_stats
+
+
+class Client:
+    """An /events socket that takes `accept` bytes of each frame, or fails."""
+
+    def __init__(self, accept=None, error=None):
+        self.accept = accept
+        self.error = error
+        self.frames = []
+        self.closed = False
+
+    def send(self, frame):
+        if self.error:
+            raise self.error
+        sent = len(frame) if self.accept is None else min(self.accept, len(frame))
+        self.frames.append(frame[:sent])
+        return sent
+
+    def close(self):
+        self.closed = True
+
+
+class Broker:
+    """umqtt client stand-in; `fail` publishes raise before any succeeds."""
+
+    class Sock:
+        closed = False
+
+        def close(self):
+            self.closed = True
+
+    def __init__(self, fail=0):
+        self.fail = fail
+        self.sock = Broker.Sock()
+        self.messages = []
+
+    def publish(self, topic, message):
+        if self.fail:
+            self.fail -= 1
+            raise OSError('ECONNRESET')
+        self.messages.append((topic, message))
+
+
+class Stop(Exception):
+    pass
+
+
+@pytest.fixture(autouse=True)
+def stats(monkeypatch):
+    for item in (sensor_stats.streams, sensor_stats.rules, sensor_stats.actions,
+                 sensor_stats.clients, sensor_stats._mqtt_queue):
+        item.clear()
+    monkeypatch.setattr(sensor_stats, 'mqtt', None)
+    yield
+    for item in (sensor_stats.streams, sensor_stats.rules, sensor_stats.clients, sensor_stats._mqtt_queue):
+        item.clear()
+
+
+def events(client):
+    result = []
+    for frame in client.frames:
+        kind, data = frame.decode().strip().split('\n')
+        result.append((kind[len('event: '):], json.loads(data[len('data: '):])))
+    return result
+
+
+def test_window_summary_drops_old_buckets():
+    window = sensor_stats.Window(60)
+    for ts, value in ((0, 1.0), (10, 5.0), (20, 3.0), (25, 4.0)):
+        window.add(ts, value)
+    assert window.summary(25) == (1.0, 5.0, 3.25)
+    assert window.summary(65) == (3.0, 5.0, 4.0)
+    assert window.summary(200) is None
+
+
+def test_window_reuses_a_bucket_for_a_later_period():
+    window = sensor_stats.Window(60)
+    window.add(0, 10.0)
+    window.add(60, 2.0)
+    assert window.summary(60) == (2.0, 2.0, 2.0)
+
+
+def test_stats_of_a_silent_sensor_age_out(monkeypatch):
+    stream = sensor_stats.Stream()
+    stream.add(1000, 20.0, 0)
+    stream.add(1002, 22.0, 2000)
+    assert stream.rate == 1.0
+    monkeypatch.setattr(time, 'time', lambda: 1002.5)
+    assert stream.to_dict()['windows']['60'] == {'min': 20.0, 'max': 22.0, 'mean': 21.0}
+    monkeypatch.setattr(time, 'time', lambda: 1002.5 + 3600)
+    assert stream.to_dict()['windows'] == {}
+    assert stream.to_dict()['value'] == 22.0
+
+
+def test_rule_above_fires_once_and_clears_past_the_hysteresis():
+    rule = sensor_stats.Rule({'name': 'hot', 'sensor': 's', 'field': 'f', 'above': 30, 'hysteresis': 0.5})
+    states = [rule.check(value) for value in (29, 31, 30.8, 29.7, 29.4, 29, 31)]
+    assert states == [None, True, None, None, False, None, True]
+
+
+def test_rule_below_fires_once_and_clears_past_the_hysteresis():
+    rule = sensor_stats.Rule({'name': 'dry', 'sensor': 's', 'field': 'f', 'below': 20, 'hysteresis': 1})
+    states = [rule.check(value) for value in (21, 19, 18, 20.5, 21.5)]
+    assert states == [None, True, None, None, False]
+
+
+def test_rule_without_a_field_is_skipped(tmp_path):
+    path = tmp_path / 'alerts.json'
+    path.write_text(json.dumps({'rules': [{'name': 'bad', 'sensor': 's'},
+                                          {'name': 'ok', 'sensor': 's', 'field': 'f', 'above': 1}]}))
+    assert [rule.name for rule in sensor_stats.load_rules(str(path))] == ['ok']
+    assert sensor_stats.mqtt is None
+
+
+def test_samples_run_rule_actions_and_push_changed_readings():
+    client = Client()
+    sensor_stats.clients.append(client)
+    fired = []
+    sensor_stats.actions['led'] = fired.append
+    sensor_stats.rules.append(sensor_stats.Rule(
+        {'name': 'hot', 'sensor': 'dht11', 'field': 'temperature', 'above': 30, 'actions': ['led', 'push']}))
+    sensor_stats.on_sample('dht11', ('temperature', 'humidity'), 100, (25.0, 40.0))
+    sensor_stats.on_sample('dht11', ('temperature', 'humidity'), 102, (31.0, 40.0))
+    sensor_stats.on_sample('dht11', ('temperature', 'humidity'), 104, (31.0, 40.0))
+    assert [event['state'] for event in fired] == ['fired']
+    assert events(client) == [
+        ('reading', {'sensor': 'dht11', 'timestamp': 100, 'values': {'temperature': 25.0, 'humidity': 40.0}}),
+        ('alert', fired[0]),
+        ('reading', {'sensor': 'dht11', 'timestamp': 102, 'values': {'temperature': 31.0}}),
+    ]
+    assert json.loads(sensor_stats.stats_json())['alerts'] == {'hot': True}
+
+
+def test_publish_drops_slow_and_broken_clients():
+    good, slow, broken = Client(), Client(accept=5), Client(error=OSError('EAGAIN'))
+    sensor_stats.clients.extend([good, slow, broken])
+    sensor_stats.publish('reading', {'a': 1})
+    assert sensor_stats.clients == [good]
+    assert slow.closed and broken.closed and not good.closed
+
+
+def test_publish_survives_a_client_evicted_meanwhile():
+    class Evicted(Client):
+        def send(self, frame):
+            sensor_stats.clients.remove(self)  # add_client() on the web thread
+            raise OSError('EBADF')
+
+    evicted, good = Evicted(), Client()
+    sensor_stats.clients.extend([evicted, good])
+    sensor_stats.publish('reading', {'a': 1})
+    assert evicted.closed
+    assert sensor_stats.clients == [good]
+    assert len(good.frames) == 1
+
+
+def test_mqtt_messages_are_queued_not_sent(monkeypatch):
+    monkeypatch.setattr(sensor_stats, 'mqtt', {'broker': '10.0.0.1', 'topic': 't'})
+    for i in range(sensor_stats.MQTT_QUEUE_LEN + 4):
+        sensor_stats.publish('reading', {'i': i})
+    queue = sensor_stats._mqtt_queue
+    assert len(queue) == sensor_stats.MQTT_QUEUE_LEN
+    assert queue[0] == ('t/reading', json.dumps({'i': 4}))
+
+
+def test_mqtt_worker_reconnects_and_keeps_the_failed_message(monkeypatch):
+    monkeypatch.setattr(sensor_stats, 'mqtt', {'broker': '10.0.0.1'})
+    brokers = [None, Broker(fail=1), Broker()]
+    sleeps = []
+
+    def connect():
+        broker = brokers.pop(0)
+        if broker is None:
+            raise OSError('EHOSTUNREACH')
+        return broker
+
+    def sleep_ms(ms):
+        sleeps.append(ms)
+        if not sensor_stats._mqtt_queue:
+            raise Stop
+    monkeypatch.setattr(sensor_stats, '_mqtt_connect', connect)
+    monkeypatch.setattr(time, 'sleep_ms', sleep_ms)
+    first, second = ('t/reading', '1'), ('t/reading', '2')
+    sensor_stats._mqtt_queue.extend([first, second])
+    reset, working = brokers[1], brokers[2]
+    with pytest.raises(Stop):
+        sensor_stats._mqtt_worker()
+    assert sleeps == [sensor_stats.MQTT_RETRY_MS, 100]
+    assert reset.sock.closed
+    assert working.messages == [first, second]
@@ -9,9 +9,9 @@
     It reads temperature and humidity data from the sensor and then hosts a web server on the ESP32. 
     The web server serves a webpage that displays the live sensor data. 
 
-    The webpage continuously fetches the latest temperature and humidity readings from the ESP32 
-    using an API endpoint provided by the server. The sensor data is updated in real-time on the webpage, 
-    giving users a live view of the environmental conditions.
+    The webpage loads the latest temperature and humidity readings from the ESP32 once and then
+    subscribes to `/events`, where the device pushes every reading that changed. The sensor data is
+    updated in real-time on the webpage, giving users a live view of the environmental conditions.
     
 """
 
@@ -19,27 +19,32 @@
 
 import usocket as socket
 from machine import Pin
-import gc,ujson,machine,uos,ubinascii,time,_thread,dht,network
+import gc,ujson,machine,uos,ubinascii,time,_thread,network
+import sensor_handler,sensor_stats,sensor_export,config_store,discovery
+
+# Settings are kept in config.json and changed through /api/config
+CONFIG = config_store.load({'device_name': "Nikhils ESP32"})
 
 # Wi-Fi connection details
-SSID = 'SSID'
-PASSWORD = 'PASSWORD'
+SSID = CONFIG['ssid']
+PASSWORD = CONFIG['password']
 
-DEVICE_NAME = "Nikhils ESP32"
-GPIO_DHT11 = 4  # D4 pin
-GPIO_LED = 2
+DEVICE_NAME = CONFIG['device_name']
+GPIO_DHT11 = CONFIG['gpio_dht11']  # D4 pin by default
+GPIO_LED = CONFIG['gpio_led']
 
-# Initialize DHT11 sensor
-DHT_PIN = Pin(GPIO_DHT11)  # Replace with your correct GPIO pin
-sensor = dht.DHT11(DHT_PIN)
+# Sensors come from sensors.json; without it only the DHT11 on GPIO_DHT11 is used
+DEFAULT_SENSORS = [
+    {'name': 'dht11', 'driver': 'dht11', 'pin': GPIO_DHT11, 'interval': 2000},
+]
 led_pin = Pin(GPIO_LED, Pin.OUT)
 
 # Manually Network setup
-IP_ADDR = '192.168.1.1'
-GATEWAY = IP_ADDR
-SUBNET = '255.255.255.0'
-DNS_ONE = '8.8.8.8'
-DNS_TWO = '8.8.4.4'
+IP_ADDR = CONFIG['ip_addr']
+GATEWAY = CONFIG['gateway']
+SUBNET = CONFIG['subnet']
+DNS_ONE = CONFIG['dns_one']
+DNS_TWO = CONFIG['dns_two']
 
 
 # HTML webpage with basic CSS
@@ -106,52 +111,56 @@ HTML_PAGE = r"""
     <script>
         const wifiIcon = document.getElementById('wifiIcon');
 
-        let lastDataReceivedTime = Date.now();
-
-        function resetDataIfNoUpdate() {
-            const currentTime = Date.now();
-            if (currentTime - lastDataReceivedTime >= 3000) {
-                updateUI({
-                    temperature: '0',
-                    humidity: '0'
-                });
-                wifiIcon.classList.remove('wifi-connected');
-                wifiIcon.classList.add('wifi-disconnected');
+        const current = {temperature: 'N/A', humidity: 'N/A'};
+
+        function setConnected(connected) {
+            wifiIcon.classList.toggle('wifi-connected', connected);
+            wifiIcon.classList.toggle('wifi-disconnected', !connected);
+        }
+
+        function applyValues(values) {
+            if (values['temperature'] !== undefined) {
+                current.temperature = `${values['temperature']}°C`;
+            }
+            if (values['humidity'] !== undefined) {
+                current.humidity = `${values['humidity']}%`;
             }
+            updateUI(current);
         }
 
-        const API_URL = '/dht11';
-
-        function fetchData() {
-            const xhr = new XMLHttpRequest();
-            xhr.open('GET', API_URL, true);
-            xhr.onreadystatechange = function () {
-                if (xhr.readyState === 4 && xhr.status === 200) {
-                    lastDataReceivedTime = Date.now();
-                    console.log("Received data:", xhr.responseText);
-                    try {
-                        const rawData = JSON.parse(xhr.responseText);
-                        console.log("Parsed data:", rawData);
-                        const modifiedData = {
-                            temperature: rawData['temperature'] !== undefined ? `${rawData['temperature']}°C` : 'N/A',
-                            humidity: rawData['humidity'] !== undefined ? `${rawData['humidity']}%` : 'N/A'
-                        };
-                        updateUI(modifiedData);
-                        wifiIcon.classList.remove('wifi-disconnected');
-                        wifiIcon.classList.add('wifi-connected');
-                    } catch (error) {
-                        console.error("Error parsing data:", error);
-                    }
-                } else {
-                    wifiIcon.classList.remove('wifi-connected');
-                    wifiIcon.classList.add('wifi-disconnected');
+        // Show the latest reading once, then follow the changes pushed on /events
+        const xhr = new XMLHttpRequest();
+        xhr.open('GET', '/dht11', true);
+        xhr.onreadystatechange = function () {
+            if (xhr.readyState === 4 && xhr.status === 200) {
+                try {
+                    applyValues(JSON.parse(xhr.responseText));
+                } catch (error) {
+                    console.error("Error parsing data:", error);
                 }
-            };
-            xhr.send();
-        }
+            }
+        };
+        xhr.send();
 
-        setInterval(fetchData, 1000);
-        setInterval(resetDataIfNoUpdate, 1000);
+        const events = new EventSource('/events');
+        events.onopen = function () {
+            setConnected(true);
+        };
+        events.onerror = function () {
+            // EventSource reconnects on its own
+            setConnected(false);
+        };
+        events.addEventListener('reading', function (event) {
+            try {
+                const reading = JSON.parse(event.data);
+                if (reading.sensor === 'dht11') {
+                    applyValues(reading.values);
+                    setConnected(true);
+                }
+            } catch (error) {
+                console.error("Error parsing data:", error);
+            }
+        });
 
         function updateUI(data) {
             document.getElementById('heat').innerText = `Temperature: ${data.temperature}`;
@@ -233,14 +242,37 @@ def wifi_ap(ssid=DEVICE_NAME, password=''):
     print('DNS server:', ap.ifconfig()[3])
 
 def read_dht11():
-    try:
-        sensor.measure()  # Trigger a measurement
-        temp = sensor.temperature()  # Get the temperature in Celsius
-        humi = sensor.humidity()  # Get the humidity percentage
-        return temp, humi
-    except OSError as e:
-        print('Failed to read sensor.')
+    # Latest reading taken by the sensor scheduler
+    values = sensor_handler.read('dht11')
+    if values is None:
+        print('No sensor data yet.')
         return None, None
+    return values['temperature'], values['humidity']
+
+def get_header(raw, name):
+    """Value of request header `name` (lowercase bytes, e.g. b'accept'), or b''."""
+    head = raw.partition(b'\r\n\r\n')[0]
+    for line in head.split(b'\r\n')[1:]:
+        key, _, value = line.partition(b':')
+        if key.strip().lower() == name:
+            return value.strip()
+    return b''
+
+def read_body(cl, raw):
+    """Return the request body, reading the rest of it if it did not fit in the first recv.
+
+    Returns None when the body is larger than `config_store.MAX_BODY`.
+    """
+    body = raw.partition(b'\r\n\r\n')[2]
+    length = int(get_header(raw, b'content-length') or 0)
+    if length > config_store.MAX_BODY:
+        return None
+    while len(body) < length:
+        chunk = cl.recv(length - len(body))
+        if not chunk:
+            break
+        body += chunk
+    return body
 
 def host_socket():
     """Host the main web server on the ESP32."""
@@ -253,8 +285,9 @@ def host_socket():
     while True:
         cl, addr = s.accept()
         print('Client connected from', addr)
-        request = cl.recv(1024)
-        request = str(request)
+        raw = cl.recv(1024)
+        request = str(raw)
+        path = request.split(' ')[1] if request.count(' ') else ''
 
         if 'GET /dht11' in request:
             temp, humi = read_dht11()
@@ -269,6 +302,45 @@ def host_socket():
             else:
                 response = 'Failed to retrieve data from sensor.'
                 http_response = 'HTTP/1.1 500 Internal Server Error\r\nContent-Type: text/plain\r\n\r\n' + response
+        elif 'GET /api/config' in request:
+            http_response = 'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n\r\n' + ujson.dumps(config_store.public())
+        elif 'POST /api/config' in request:
+            try:
+                body = read_body(cl, raw)
+                error = None if body is None else config_store.update(ujson.loads(body))
+            except (ValueError, AttributeError):
+                body = b''
+                error = 'Body must be a JSON object of settings.'
+            if body is None:
+                http_response = 'HTTP/1.1 413 Payload Too Large\r\nContent-Type: text/plain\r\n\r\n413 Payload Too Large.'
+            elif error is None:
+                http_response = 'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n\r\n' + ujson.dumps({'saved': True, 'restart_required': True})
+            else:
+                http_response = 'HTTP/1.1 400 Bad Request\r\nContent-Type: text/plain\r\n\r\n' + error
+        elif 'GET /stats' in request:
+            http_response = 'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n\r\n' + sensor_stats.stats_json()
+        elif 'GET /events' in request:
+            # Keep the connection open, sensor_stats pushes readings and alerts to it
+            sensor_stats.add_client(cl)
+            continue
+        elif 'GET /sensors' in request:
+            path, _, query = path.partition('?')
+            if path.startswith('/sensors/') and path.endswith('/history'):
+                name = path[len('/sensors/'):-len('/history')]
+                content_type = sensor_export.negotiate(get_header(raw, b'accept').decode(), query)
+                hist = sensor_handler.history.get(name)
+                if hist is not None and content_type != sensor_export.JSON:
+                    # Binary formats are sent from a copy of the history buffers, without per-sample objects
+                    sensor_export.send(cl, name, hist, content_type)
+                    cl.close()
+                    continue
+                response = sensor_handler.history_json(name)
+            else:
+                response = sensor_handler.sensors_json()
+            if response is not None:
+                http_response = 'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n\r\n' + response
+            else:
+                http_response = 'HTTP/1.1 404 Not Found\r\nContent-Type: text/html\r\n\r\n' + ERROR_PAGE
         elif 'GET /' in request:
             # Serve the HTML content
             http_response = 'HTTP/1.1 200 OK\r\nContent-Type: text/html\r\n\r\n' + HTML_PAGE
@@ -281,8 +353,16 @@ def host_socket():
 
 
 def start_server():
-    """Start the web server."""
+    """Start the web server and answer discovery broadcasts for it."""
     _thread.start_new_thread(host_socket, ())
+    discovery.start(DEVICE_NAME)
+
+def start_sensors():
+    """Load the sensor drivers and start sampling them in the background."""
+    sensor_handler.load_config('sensors.json', DEFAULT_SENSORS)
+    sensor_stats.actions['led'] = lambda event: _thread.start_new_thread(led_on_off, (0.1, 5))
+    sensor_stats.attach('alerts.json')
+    _thread.start_new_thread(sensor_handler.run, ())
 
 def boot_screen():
     boot_screen_data = []
@@ -311,6 +391,7 @@ def main():
     # connect_wifi(SSID, PASSWORD)
     
     time.sleep(1)
+    start_sensors()
     start_server()
     led_pin.off()
 
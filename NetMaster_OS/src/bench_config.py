@@ -0,0 +1,61 @@
+"""
+            @project NetMaster_OS
+            @date 19-10-2026
+
+    Boot-time config load benchmark.
+
+    Upload `config_store.py` and run this file on the ESP32 from Thonny. It writes
+    the default settings once the way `config_store.save()` does (compact JSON) and
+    once as indented JSON, then times:
+
+    - `compact` / `indented`: loading each file the way `config_store.load()` does at
+      boot, one `read()` plus `config_store.decode()`. The loader is the same for
+      both, so the only difference is the whitespace on flash.
+    - `get`: a cached `config_store.get()`, what the apps pay after boot.
+
+    An earlier `config_store` kept the settings in a custom binary codec. It was
+    dropped: `ujson` parses in C, there were no ESP32 numbers showing the codec
+    loaded faster, and it made the file unreadable by hand and the decoder another
+    thing to validate. This benchmark is where such numbers would come from.
+
+    Both files are written under a `bench_` prefix and removed afterwards.
+"""
+
+import time,ujson,uos
+import config_store
+
+RUNS = 200
+COMPACT_FILE = 'bench_config.json'
+INDENTED_FILE = 'bench_config_indented.json'
+
+
+def load(path):
+    with open(path) as f:
+        return config_store.decode(f.read())
+
+def get_cached(path):
+    return config_store.get('ssid')
+
+def timed(fn, path):
+    start = time.ticks_us()
+    for _ in range(RUNS):
+        fn(path)
+    return time.ticks_diff(time.ticks_us(), start) / RUNS
+
+def main():
+    values = dict(config_store.DEFAULTS)
+    config_store.save(values, COMPACT_FILE)
+    with open(INDENTED_FILE, 'w') as f:
+        f.write('{\n' + ',\n'.join(f'    {ujson.dumps(k)}: {ujson.dumps(v)}' for k, v in values.items()) + '\n}\n')
+    assert load(COMPACT_FILE) == load(INDENTED_FILE)
+    config_store.load(None, COMPACT_FILE)
+
+    for name, path in (('compact', COMPACT_FILE), ('indented', INDENTED_FILE)):
+        size = uos.stat(path)[6]
+        print(f"{name:>8}: {size} bytes, {timed(load, path):.0f} us per load")
+    print(f"{'get':>8}: {timed(get_cached, None):.1f} us per cached lookup")
+
+    uos.remove(COMPACT_FILE)
+    uos.remove(INDENTED_FILE)
+
+main()
@@ -0,0 +1,59 @@
+"""
+            @project NetMaster_OS
+            @date 19-10-2026
+
+    Sensor history export benchmark.
+
+    Upload `sensor_handler.py` and `sensor_export.py` and run this file on the ESP32
+    from Thonny. It fills a full two-field history (like the DHT11's) and times
+    exporting it as JSON, CBOR and the packed format to a socket stand-in that only
+    counts bytes, then prints the time and bytes per sample of each.
+"""
+
+import time,gc
+import sensor_handler,sensor_export
+
+RUNS = 20
+NAME = 'bench'
+
+
+class CountingSocket:
+    def __init__(self):
+        self.sent = 0
+
+    def sendall(self, data):
+        if isinstance(data, str):
+            data = data.encode()
+        self.sent += len(bytes(data))
+
+
+def export_json(cl, hist):
+    cl.sendall(sensor_handler.history_json(NAME))
+
+def export_cbor(cl, hist):
+    sensor_export.send_cbor(cl, NAME, hist)
+
+def export_packed(cl, hist):
+    sensor_export.send_packed(cl, NAME, hist)
+
+def main():
+    hist = sensor_handler.History(('temperature', 'humidity'))
+    sensor_handler.history[NAME] = hist
+    now = int(time.time())
+    for i in range(hist.size + hist.size // 3):  # Wrap the ring like a long-running device
+        hist.append(now + 2 * i, (20 + i % 10 * 0.5, 40 + i % 7))
+
+    for name, fn in (('json', export_json), ('cbor', export_cbor), ('packed', export_packed)):
+        gc.collect()
+        cl = CountingSocket()
+        start = time.ticks_us()
+        for _ in range(RUNS):
+            fn(cl, hist)
+        elapsed = time.ticks_diff(time.ticks_us(), start) / RUNS
+        size = cl.sent // RUNS
+        print(f"{name:>6}: {elapsed:.0f} us, {size} bytes, "
+              f"{elapsed / hist.count:.1f} us and {size / hist.count:.1f} bytes per sample")
+
+    del sensor_handler.history[NAME]
+
+main()
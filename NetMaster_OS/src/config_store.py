@@ -0,0 +1,151 @@
+"""
+            @project NetMaster_OS
+            @date 19-10-2026
+
+    Persistent settings for NetMaster_OS.
+
+    Settings such as the WiFi credentials, `DEVICE_NAME`, GPIO numbers and the
+    network addresses live in one compact JSON file on flash (`config.json`, no
+    whitespace). `load()` reads it with a single `read()` and one `ujson.loads()` at
+    boot and caches the parsed values, so `get()` never touches the flash again.
+
+    `save()` writes `config.json.tmp`, checks it parses, then renames it over
+    `config.json`, so a failed write leaves the old settings in place. A leftover
+    temporary file is used when `config.json` itself is missing or corrupt.
+
+    Every value is checked by `check()` both in `update()` and at boot, so a setting
+    that would stop the device from starting (a GPIO the ESP32 does not have, a
+    malformed IP address) is refused, and one already on flash is replaced by its
+    default instead of crashing `main.py`.
+"""
+
+import ujson,uos
+
+CONFIG_FILE = 'config.json'
+
+# Settings shared by every NetMaster_OS application, used until they are changed
+DEFAULTS = {
+    'device_name': 'NetMaster_OS',
+    'ssid': 'SSID',
+    'password': 'PASSWORD',
+    'gpio_led': 2,
+    'gpio_dht11': 4,
+    'ip_addr': '192.168.1.1',
+    'gateway': '192.168.1.1',
+    'subnet': '255.255.255.0',
+    'dns_one': '8.8.8.8',
+    'dns_two': '8.8.4.4',
+}
+
+GPIO_MAX = 39         # Highest GPIO number on the ESP32
+ADDRESS_KEYS = ('ip_addr', 'gateway', 'subnet', 'dns_one', 'dns_two')
+MAX_LENGTHS = {'device_name': 32, 'ssid': 32, 'password': 64}  # WiFi limits
+MAX_BODY = 1024       # Largest /api/config request body accepted, in bytes
+
+_cache = {}
+
+
+def encode(values):
+    return ujson.dumps(values, separators=(',', ':'))
+
+def decode(data):
+    # Truncated or hand-edited files must fail as ValueError, which load() handles
+    values = ujson.loads(data)
+    if not isinstance(values, dict):
+        raise ValueError('config is not an object')
+    return values
+
+def _read(path):
+    with open(path) as f:
+        return decode(f.read())
+
+
+def _is_address(value):
+    parts = value.split('.')
+    if len(parts) != 4:
+        return False
+    for part in parts:
+        if not part.isdigit() or int(part) > 255:
+            return False
+    return True
+
+def check(key, value, default):
+    """Return an error message if `value` is not usable for setting `key`, else None."""
+    if isinstance(default, bool):
+        if not isinstance(value, bool):
+            return f"{key} must be true or false"
+    elif isinstance(default, int):
+        if isinstance(value, bool) or not isinstance(value, int):
+            return f"{key} must be a whole number"
+        if key.startswith('gpio_') and not 0 <= value <= GPIO_MAX:
+            return f"{key} must be a GPIO number from 0 to {GPIO_MAX}"
+    elif isinstance(default, str):
+        if not isinstance(value, str):
+            return f"{key} must be a string"
+        if key in ADDRESS_KEYS and not _is_address(value):
+            return f"{key} must be an address like 192.168.1.1"
+        if len(value.encode()) > MAX_LENGTHS.get(key, 64):
+            return f"{key} is too long"
+    return None
+
+
+def load(defaults=None, path=CONFIG_FILE):
+    """Cache and return `DEFAULTS`, then the app's `defaults`, overridden by the stored settings."""
+    _cache.clear()
+    _cache.update(DEFAULTS)
+    if defaults:
+        _cache.update(defaults)
+    for candidate in (path, path + '.tmp'):
+        try:
+            stored = _read(candidate)
+        except (OSError, ValueError) as e:
+            print(f"Config {candidate} not loaded: {e}")
+            continue
+        for key, value in stored.items():
+            error = check(key, value, _cache.get(key, value))
+            if error:
+                print(f"Config: {error}, using the default.")
+            else:
+                _cache[key] = value
+        break
+    return _cache
+
+def get(key, default=None):
+    return _cache.get(key, default)
+
+def save(values, path=CONFIG_FILE):
+    tmp = path + '.tmp'
+    data = encode(values)
+    with open(tmp, 'w') as f:
+        f.write(data)
+    _read(tmp)  # Never replace good settings with a file that does not decode
+    try:
+        uos.rename(tmp, path)
+    except OSError:
+        # Some filesystems will not rename over an existing file
+        uos.remove(path)
+        uos.rename(tmp, path)
+
+def update(changes, path=CONFIG_FILE):
+    """Validate `changes` against the cached settings, then save and cache them.
+
+    Returns an error message, or None on success.
+    """
+    values = dict(_cache)
+    for key, value in changes.items():
+        if key not in values:
+            return f"Unknown setting: {key}"
+        error = check(key, value, values[key])
+        if error:
+            return error
+        values[key] = value
+    try:
+        save(values, path)
+    except (OSError, ValueError) as e:
+        return f"Failed to save config: {e}"
+    _cache.update(values)
+    return None
+
+def public():
+    """Cached settings without secrets, for the web interface."""
+    return {key: value for key, value in _cache.items() if 'password' not in key}
@@ -0,0 +1,41 @@
+"""
+            @project NetMaster_OS
+            @date 19-10-2026
+
+    UDP discovery responder for NetMaster_OS.
+
+    Host tools find devices on the network by broadcasting `DISCOVERY_MESSAGE` to
+    `DISCOVERY_PORT`. Every device answers, to the sender, with a small JSON object:
+
+        {"name": DEVICE_NAME, "id": chip id, "port": HTTP port}
+
+    The device's IP address is the source address of the reply.
+"""
+
+import socket,ujson,ubinascii,machine,_thread
+
+DISCOVERY_PORT = 50505
+DISCOVERY_MESSAGE = b'NETMASTER_DISCOVER'
+
+
+def responder(device_name, http_port=80):
+    s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    s.bind(socket.getaddrinfo('0.0.0.0', DISCOVERY_PORT)[0][-1])
+    reply = ujson.dumps({
+        'name': device_name,
+        'id': ubinascii.hexlify(machine.unique_id()).decode(),
+        'port': http_port,
+    }).encode()
+    print('Discovery responder on UDP port', DISCOVERY_PORT)
+
+    while True:
+        try:
+            data, addr = s.recvfrom(64)
+            if data.strip() == DISCOVERY_MESSAGE:
+                s.sendto(reply, addr)
+        except OSError as e:
+            print('Discovery error:', e)
+
+def start(device_name, http_port=80):
+    """Answer discovery broadcasts in the background."""
+    _thread.start_new_thread(responder, (device_name, http_port))
@@ -0,0 +1,150 @@
+"""
+            @project NetMaster_OS
+            @date 19-10-2026
+
+    Binary export of sensor history for NetMaster_OS.
+
+    `/sensors/<name>/history` answers in the format asked for by the `Accept` header
+    (or `?format=json|cbor|packed`). The binary formats copy the `History` arrays
+    into one bytes object per column (about 1.4 KB for 120 samples of two fields)
+    and send those, so no per-sample Python objects are made and a sample taken
+    while the response is sent cannot tear it. The body size is known from the
+    sample count, so the response carries a `Content-Length`. Everything is little endian, timestamps are int32
+    seconds and values are float32, exactly as they are stored.
+
+    - **`application/x-netmaster-packed`:**
+
+        b'NMX' | version (B) | field count (B) | timestamp size (B) | value size (B) | 0 (B) | sample count (I)
+        sensor name (B length + UTF-8) | each field name (B length + UTF-8)
+        timestamps column | one values column per field
+
+    - **`application/cbor`:** A map `{"sensor": name, "fields": [names], "t": timestamps,
+      "values": [columns]}`, where the columns are RFC 8746 typed arrays
+      (tag 78 int32 LE, tag 85 float32 LE).
+
+    `host/netmaster_fleet/export.py` decodes both formats.
+"""
+
+import struct
+
+JSON = 'application/json'
+CBOR = 'application/cbor'
+PACKED = 'application/x-netmaster-packed'
+FORMATS = {'json': JSON, 'cbor': CBOR, 'packed': PACKED}
+
+MAGIC = b'NMX'
+VERSION = 1
+TAG_INT32_LE = 78
+TAG_FLOAT32_LE = 85
+ITEM_SIZE = 4  # Bytes per timestamp ('i') and per value ('f') in a History
+
+
+def negotiate(accept='', query=''):
+    """Content type to answer with, from a `format=` query argument or the Accept header."""
+    for arg in query.split('&'):
+        if arg.startswith('format='):
+            return FORMATS.get(arg[7:], JSON)
+    if PACKED in accept:
+        return PACKED
+    if CBOR in accept:
+        return CBOR
+    return JSON
+
+
+def _copy(col, spans):
+    """One column's samples, oldest first, as bytes."""
+    view = memoryview(col)
+    data = bytearray()
+    for start, end in spans:
+        data += view[start:end]
+    return data
+
+def snapshot(hist):
+    """Copy the samples of `hist`: `(timestamps, [value columns])` as bytes.
+
+    The scheduler appends from its own thread, so the copy is taken under the
+    history's lock; every timestamp stays with its values and the oldest sample
+    stays first however long the socket takes.
+    """
+    with hist.lock:
+        spans = hist.spans()
+        return _copy(hist.ts, spans), [_copy(col, spans) for col in hist.cols]
+
+def _name(text):
+    data = text.encode()
+    return bytes([len(data)]) + data
+
+def _cbor_head(major, n):
+    major <<= 5
+    if n < 24:
+        return bytes([major | n])
+    if n < 0x100:
+        return bytes([major | 24, n])
+    if n < 0x10000:
+        return bytes([major | 25]) + struct.pack('>H', n)
+    return bytes([major | 26]) + struct.pack('>I', n)
+
+def _cbor_text(text):
+    data = text.encode()
+    return _cbor_head(3, len(data)) + data
+
+def _cbor_typed(tag, count):
+    return _cbor_head(6, tag) + _cbor_head(2, count * ITEM_SIZE)
+
+
+def _packed_head(name, hist, count):
+    head = bytearray(MAGIC)
+    head += struct.pack('<BBBBBI', VERSION, len(hist.fields), ITEM_SIZE, ITEM_SIZE, 0, count)
+    head += _name(name)
+    for field in hist.fields:
+        head += _name(field)
+    return head
+
+def _cbor_heads(name, hist, count):
+    """The CBOR bytes around the columns: the map up to `t`, the `values` key and a column head."""
+    head = bytearray(_cbor_head(5, 4))
+    head += _cbor_text('sensor') + _cbor_text(name)
+    head += _cbor_text('fields') + _cbor_head(4, len(hist.fields))
+    for field in hist.fields:
+        head += _cbor_text(field)
+    head += _cbor_text('t') + _cbor_typed(TAG_INT32_LE, count)
+    return head, _cbor_text('values') + _cbor_head(4, len(hist.cols)), _cbor_typed(TAG_FLOAT32_LE, count)
+
+
+def send_packed(cl, name, hist, snap=None):
+    ts, cols = snap or snapshot(hist)
+    cl.sendall(_packed_head(name, hist, len(ts) // ITEM_SIZE))
+    cl.sendall(ts)
+    for col in cols:
+        cl.sendall(col)
+
+def send_cbor(cl, name, hist, snap=None):
+    ts, cols = snap or snapshot(hist)
+    head, values_head, col_head = _cbor_heads(name, hist, len(ts) // ITEM_SIZE)
+    cl.sendall(head)
+    cl.sendall(ts)
+    cl.sendall(values_head)
+    for col in cols:
+        cl.sendall(col_head)
+        cl.sendall(col)
+
+def body_length(name, hist, content_type, snap):
+    """Size in bytes of the export of `snap` that `send()` writes after the headers."""
+    ts, cols = snap
+    count = len(ts) // ITEM_SIZE
+    if content_type == CBOR:
+        head, values_head, col_head = _cbor_heads(name, hist, count)
+        length = len(head) + len(values_head) + len(cols) * len(col_head)
+    else:
+        length = len(_packed_head(name, hist, count))
+    return length + len(ts) + sum(len(col) for col in cols)
+
+def send(cl, name, hist, content_type):
+    """Send a binary export of `hist` as the body of an HTTP response (headers included)."""
+    snap = snapshot(hist)
+    length = body_length(name, hist, content_type, snap)
+    cl.sendall(f'HTTP/1.1 200 OK\r\nContent-Type: {content_type}\r\nContent-Length: {length}\r\n\r\n'.encode())
+    if content_type == CBOR:
+        send_cbor(cl, name, hist, snap)
+    else:
+        send_packed(cl, name, hist, snap)
@@ -0,0 +1,345 @@
+"""
+            @project NetMaster_OS
+            @date 19-10-2026
+
+    Sensor driver framework for NetMaster_OS.
+
+    Every sensor attached to the board is described by one entry in `sensors.json`
+    and is handled by a small driver class picked from the `DRIVERS` registry.
+    A single cooperative scheduler (`tick()` / `run()`) samples every driver at its
+    own interval, so request handlers never touch the hardware directly.
+
+    - **Drivers:** A driver declares its `fields`, the bus it sits on and how to
+      `read()` one sample. Drivers sharing a bus are batched: the bus is started
+      once (e.g. one DS18X20 conversion for every probe on the wire) and all of them
+      are read together when the conversion is done.
+    - **Backoff:** A failing driver is retried at a doubling interval, capped at
+      `MAX_BACKOFF_MS` but never faster than its own interval, and goes back to its
+      normal rate after the first good read.
+    - **Storage:** Every good sample lands in the shared `latest` cache and in a
+      fixed-size `History` ring buffer, both served by the web server at `/sensors`.
+      Functions added with `subscribe()` are then called with the sample.
+
+    Example `sensors.json`:
+
+        {"sensors": [
+            {"name": "dht11", "driver": "dht11", "pin": 4, "interval": 2000},
+            {"name": "probe", "driver": "ds18x20", "pin": 5, "interval": 5000}
+        ]}
+"""
+
+import time,ujson,ubinascii,_thread
+from array import array
+from machine import Pin,ADC
+import dht
+
+MAX_BACKOFF_MS = 60000   # Longest retry interval for a failing driver
+BATCH_SLACK_MS = 200     # Drivers due this soon join a batch already started on their bus
+HISTORY_LEN = 120        # Samples kept per sensor
+
+DRIVERS = {}   # driver name in sensors.json -> driver class
+drivers = []   # configured driver instances
+latest = {}    # sensor name -> (timestamp, values)
+history = {}   # sensor name -> History
+listeners = [] # fn(name, fields, ts, values) called for every good sample
+
+_buses = {}    # bus key -> bus object shared by the drivers on it
+_pending = []  # (due ticks, drivers, start ticks) batches waiting for a conversion to finish
+
+
+class History:
+    """Fixed-size ring buffer of samples, stored column by column in arrays."""
+
+    def __init__(self, fields, size=HISTORY_LEN):
+        self.fields = fields
+        self.size = size
+        self.ts = array('i', [0] * size)
+        self.cols = [array('f', [0.0] * size) for _ in fields]
+        self.head = 0   # Next index to write
+        self.count = 0
+        self.lock = _thread.allocate_lock()  # Held by readers copying from another thread
+
+    def append(self, ts, values):
+        with self.lock:
+            i = self.head
+            self.ts[i] = ts
+            for col, value in zip(self.cols, values):
+                col[i] = value
+            self.head = (i + 1) % self.size
+            if self.count < self.size:
+                self.count += 1
+
+    def spans(self):
+        """Index ranges holding samples, oldest first (two ranges once wrapped)."""
+        start = (self.head - self.count) % self.size
+        if start + self.count <= self.size:
+            return ((start, start + self.count),)
+        return ((start, self.size), (0, self.head))
+
+    def rows(self):
+        for start, end in self.spans():
+            for i in range(start, end):
+                yield self.ts[i], [col[i] for col in self.cols]
+
+
+class Driver:
+    """Base class of all sensor drivers."""
+
+    fields = ()
+    min_interval = 100  # Fastest rate the hardware supports, in ms
+
+    def __init__(self, cfg):
+        self.name = cfg['name']
+        self.kind = cfg['driver']
+        self.interval = max(cfg.get('interval', 2000), self.min_interval)
+        self.bus = self.bus_key(cfg)
+        self.next_due = time.ticks_ms()
+        self.fails = 0
+        self.busy = False
+
+    def bus_key(self, cfg):
+        return ('pin', cfg['pin'])
+
+    def start(self, group):
+        """Start a measurement for every driver in `group`; return ms to wait before reading."""
+        return 0
+
+    def read(self):
+        """Return one sample as a tuple of floats, ordered like `fields`."""
+        raise NotImplementedError
+
+
+class DHT11Driver(Driver):
+    fields = ('temperature', 'humidity')
+    min_interval = 1000
+
+    def __init__(self, cfg):
+        super().__init__(cfg)
+        self.dev = self.make_device(Pin(cfg['pin']))
+
+    def make_device(self, pin):
+        return dht.DHT11(pin)
+
+    def read(self):
+        self.dev.measure()
+        return (self.dev.temperature(), self.dev.humidity())
+
+
+class DHT22Driver(DHT11Driver):
+    min_interval = 2000
+
+    def make_device(self, pin):
+        return dht.DHT22(pin)
+
+
+class DS18X20Driver(Driver):
+    """One probe on a 1-Wire bus; every probe on the same pin shares one conversion."""
+
+    fields = ('temperature',)
+    min_interval = 750
+
+    def __init__(self, cfg):
+        super().__init__(cfg)
+        import onewire,ds18x20
+        bus = _buses.get(self.bus)
+        if bus is None:
+            bus = ds18x20.DS18X20(onewire.OneWire(Pin(cfg['pin'])))
+            _buses[self.bus] = bus
+        self.dev = bus
+        if 'rom' in cfg:
+            self.rom = ubinascii.unhexlify(cfg['rom'])
+        else:
+            self.rom = bus.scan()[cfg.get('index', 0)]
+
+    def bus_key(self, cfg):
+        return ('onewire', cfg['pin'])
+
+    def start(self, group):
+        self.dev.convert_temp()
+        return 750
+
+    def read(self):
+        return (self.dev.read_temp(self.rom),)
+
+
+class ADCDriver(Driver):
+    """Raw analog input, optionally scaled: value = raw * scale + offset."""
+
+    def __init__(self, cfg):
+        super().__init__(cfg)
+        self.fields = (cfg.get('field', 'value'),)
+        self.adc = ADC(Pin(cfg['pin']))
+        self.scale = cfg.get('scale', 1)
+        self.offset = cfg.get('offset', 0)
+
+    def bus_key(self, cfg):
+        return ('adc', cfg['pin'])
+
+    def read(self):
+        return (self.adc.read() * self.scale + self.offset,)
+
+
+def register_driver(kind, cls):
+    DRIVERS[kind] = cls
+
+def subscribe(fn):
+    """Call `fn(name, fields, ts, values)` from the scheduler after every good sample."""
+    listeners.append(fn)
+
+register_driver('dht11', DHT11Driver)
+register_driver('dht22', DHT22Driver)
+register_driver('ds18x20', DS18X20Driver)
+register_driver('adc', ADCDriver)
+
+
+def add_sensor(cfg):
+    cls = DRIVERS.get(cfg.get('driver'))
+    if cls is None:
+        print(f"Unknown sensor driver: {cfg.get('driver')}")
+        return None
+    try:
+        drv = cls(cfg)
+    except Exception as e:
+        print(f"Failed to set up sensor {cfg.get('name')}: {e}")
+        return None
+    drivers.append(drv)
+    history[drv.name] = History(drv.fields)
+    return drv
+
+def load_config(path='sensors.json', default=None):
+    """Set up the drivers listed in `path`, or in `default` when the file is missing.
+
+    An entry in `path` named like one in `default` takes the settings it leaves
+    out (such as `pin`) from it, so pins kept in config_store still apply.
+    """
+    default = default or []
+    try:
+        with open(path) as f:
+            sensors = ujson.load(f)['sensors']
+    except (OSError, ValueError, KeyError) as e:
+        print(f"No usable {path} ({e}), using default sensors.")
+        sensors = default
+    for cfg in sensors:
+        for base in default:
+            if base.get('name') == cfg.get('name'):
+                merged = dict(base)
+                merged.update(cfg)
+                cfg = merged
+                break
+        add_sensor(cfg)
+    return drivers
+
+
+def _failed(drv, now, error):
+    drv.busy = False
+    drv.fails += 1
+    delay = max(drv.interval, min(drv.interval << min(drv.fails, 16), MAX_BACKOFF_MS))
+    drv.next_due = time.ticks_add(now, delay)
+    print(f"Sensor {drv.name} failed ({error}), retry in {delay} ms.")
+
+def _store(drv, values):
+    ts = int(time.time())
+    latest[drv.name] = (ts, values)
+    history[drv.name].append(ts, values)
+    for fn in listeners:
+        try:
+            fn(drv.name, drv.fields, ts, values)
+        except Exception as e:
+            print(f"Sensor listener failed: {e}")
+
+def _read_batch(group, now, started):
+    # Schedule from when the batch started, so a conversion wait does not add to the period
+    for drv in group:
+        drv.busy = False
+        try:
+            values = drv.read()
+        except Exception as e:
+            _failed(drv, now, e)
+            continue
+        drv.fails = 0
+        drv.next_due = time.ticks_add(started, drv.interval)
+        _store(drv, values)
+
+def tick(now=None):
+    """Run one scheduler pass: finish conversions that are ready and start due batches."""
+    if now is None:
+        now = time.ticks_ms()
+
+    for batch in _pending[:]:
+        if time.ticks_diff(now, batch[0]) >= 0:
+            _pending.remove(batch)
+            _read_batch(batch[1], now, batch[2])
+
+    due_buses = []
+    for drv in drivers:
+        if not drv.busy and time.ticks_diff(now, drv.next_due) >= 0 and drv.bus not in due_buses:
+            due_buses.append(drv.bus)
+
+    for key in due_buses:
+        group = [drv for drv in drivers
+                 if drv.bus == key and not drv.busy
+                 and time.ticks_diff(now, drv.next_due) >= -BATCH_SLACK_MS]
+        try:
+            wait = group[0].start(group)
+        except Exception as e:
+            for drv in group:
+                _failed(drv, now, e)
+            continue
+        if wait:
+            for drv in group:
+                drv.busy = True
+            _pending.append((time.ticks_add(now, wait), group, now))
+        else:
+            _read_batch(group, now, now)
+
+def next_delay(now=None):
+    """Milliseconds until the scheduler has work to do again."""
+    if now is None:
+        now = time.ticks_ms()
+    delay = MAX_BACKOFF_MS
+    for batch in _pending:
+        delay = min(delay, time.ticks_diff(batch[0], now))
+    for drv in drivers:
+        if not drv.busy:
+            delay = min(delay, time.ticks_diff(drv.next_due, now))
+    return max(delay, 10)
+
+def run():
+    """Scheduler loop; start it in its own thread with `_thread.start_new_thread(run, ())`."""
+    while True:
+        tick()
+        time.sleep_ms(next_delay())
+
+
+def read(name):
+    """Latest values of sensor `name` as a dict, or None if it has not been read yet."""
+    entry = latest.get(name)
+    if entry is None:
+        return None
+    fields = history[name].fields
+    return {fields[i]: entry[1][i] for i in range(len(fields))}
+
+def sensors_json():
+    result = {}
+    for drv in drivers:
+        entry = latest.get(drv.name)
+        result[drv.name] = {
+            'driver': drv.kind,
+            'interval': drv.interval,
+            'fails': drv.fails,
+            'timestamp': entry[0] if entry else None,
+            'values': read(drv.name),
+        }
+    return ujson.dumps(result)
+
+def history_json(name):
+    hist = history.get(name)
+    if hist is None:
+        return None
+    with hist.lock:
+        samples = [[ts] + values for ts, values in hist.rows()]
+    return ujson.dumps({
+        'sensor': name,
+        'fields': hist.fields,
+        'samples': samples,
+    })
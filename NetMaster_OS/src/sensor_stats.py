@@ -0,0 +1,323 @@
+"""
+            @project NetMaster_OS
+            @date 19-10-2026
+
+    Streaming statistics and threshold alerts for NetMaster_OS sensors.
+
+    `attach()` subscribes to `sensor_handler`, so every sample taken by the sensor
+    scheduler updates the statistics of each of its fields in O(1):
+
+    - **EWMA:** Exponentially weighted moving average with factor `EWMA_ALPHA`.
+    - **Rate of change:** Units per second between the last two samples.
+    - **Rolling windows:** Min / max / mean over each window in `WINDOWS`. A window is
+      split into `WINDOW_BUCKETS` time buckets, so a sample only touches one bucket
+      and old samples fall out a bucket at a time.
+
+    Threshold rules from `alerts.json` are checked against the statistics after every
+    sample. A rule fires once when its metric crosses the threshold and clears once it
+    comes back past the hysteresis band; both edges run the rule's actions:
+
+        {"rules": [
+            {"name": "hot", "sensor": "dht11", "field": "temperature", "metric": "ewma",
+             "above": 30, "hysteresis": 0.5, "actions": ["led", "push"]},
+            {"name": "dry", "sensor": "dht11", "field": "humidity", "below": 20}
+        ],
+         "mqtt": {"broker": "192.168.1.10", "topic": "netmaster/events"}}
+
+    The "push" action sends the event to every `/events` (Server-Sent Events) client
+    and, when configured, to the MQTT broker. Readings that changed since the previous
+    sample are pushed the same way, so clients can subscribe instead of polling.
+    Other actions (such as "led") are functions the application puts in `actions`.
+
+    MQTT messages wait in a short queue served by their own thread, which connects
+    to the broker and reconnects after a failure, so a slow or unreachable broker
+    never holds up sampling.
+"""
+
+import time,ujson,_thread
+from array import array
+import sensor_handler
+
+EWMA_ALPHA = 0.2
+WINDOWS = (60, 300, 900)   # Rolling window lengths in seconds
+WINDOW_BUCKETS = 6
+MAX_CLIENTS = 4            # Open /events connections kept at once
+MQTT_QUEUE_LEN = 16        # MQTT messages kept while the broker is unreachable
+MQTT_RETRY_MS = 30000      # Wait before reconnecting to the broker
+MQTT_TIMEOUT_S = 10        # Socket timeout of the broker connection
+
+streams = {}   # (sensor, field) -> Stream
+rules = []
+actions = {}   # action name -> fn(event)
+clients = []   # Sockets subscribed to /events
+mqtt = None    # MQTT settings from alerts.json, if any
+_mqtt_queue = []  # (topic, message) waiting for the MQTT thread
+
+
+class Window:
+    """Min / max / mean over the last `seconds`, kept in `WINDOW_BUCKETS` time buckets."""
+
+    def __init__(self, seconds, buckets=WINDOW_BUCKETS):
+        self.seconds = seconds
+        self.width = max(seconds // buckets, 1)
+        self.ids = array('i', [-1] * buckets)
+        self.mins = array('f', [0.0] * buckets)
+        self.maxs = array('f', [0.0] * buckets)
+        self.sums = array('f', [0.0] * buckets)
+        self.counts = array('i', [0] * buckets)
+
+    def add(self, ts, value):
+        bucket = ts // self.width
+        i = bucket % len(self.ids)
+        if self.ids[i] != bucket:
+            self.ids[i] = bucket
+            self.mins[i] = self.maxs[i] = self.sums[i] = value
+            self.counts[i] = 1
+            return
+        if value < self.mins[i]:
+            self.mins[i] = value
+        if value > self.maxs[i]:
+            self.maxs[i] = value
+        self.sums[i] += value
+        self.counts[i] += 1
+
+    def summary(self, ts):
+        """(min, max, mean) of the samples still inside the window, or None."""
+        oldest = ts // self.width - len(self.ids)
+        lo = hi = None
+        total = 0
+        count = 0
+        for i in range(len(self.ids)):
+            # Unused buckets (id -1) are still "recent" while the clock is near 0 after boot
+            if self.ids[i] <= oldest or not self.counts[i]:
+                continue
+            if lo is None or self.mins[i] < lo:
+                lo = self.mins[i]
+            if hi is None or self.maxs[i] > hi:
+                hi = self.maxs[i]
+            total += self.sums[i]
+            count += self.counts[i]
+        if not count:
+            return None
+        return lo, hi, total / count
+
+
+class Stream:
+    """Statistics of one sensor field."""
+
+    def __init__(self):
+        self.value = None
+        self.ewma = None
+        self.rate = 0.0
+        self.ts = 0
+        self.last_ms = 0
+        self.windows = [Window(seconds) for seconds in WINDOWS]
+
+    def add(self, ts, value, now_ms):
+        if self.value is None:
+            self.ewma = value
+        else:
+            self.ewma += EWMA_ALPHA * (value - self.ewma)
+            dt = time.ticks_diff(now_ms, self.last_ms)
+            if dt > 0:
+                self.rate = (value - self.value) * 1000 / dt
+        self.value = value
+        self.ts = ts
+        self.last_ms = now_ms
+        for window in self.windows:
+            window.add(ts, value)
+
+    def metric(self, name):
+        if name == 'ewma':
+            return self.ewma
+        if name == 'rate':
+            return self.rate
+        return self.value
+
+    def to_dict(self):
+        windows = {}
+        for window in self.windows:
+            # Summarise at the current time, so a sensor that stopped reporting ages out
+            summary = window.summary(int(time.time()))
+            if summary:
+                windows[str(window.seconds)] = {'min': summary[0], 'max': summary[1], 'mean': summary[2]}
+        return {'value': self.value, 'ewma': self.ewma, 'rate': self.rate, 'windows': windows}
+
+
+class Rule:
+    def __init__(self, cfg):
+        self.name = cfg['name']
+        self.sensor = cfg['sensor']
+        self.field = cfg['field']
+        self.metric = cfg.get('metric', 'value')
+        self.above = cfg.get('above')
+        self.below = cfg.get('below')
+        self.hysteresis = cfg.get('hysteresis', 0)
+        self.actions = cfg.get('actions', ['push'])
+        self.active = False
+
+    def check(self, value):
+        """Return True / False when the rule fires / clears, None when nothing changed."""
+        if self.active:
+            if self.above is not None and value > self.above - self.hysteresis:
+                return None
+            if self.below is not None and value < self.below + self.hysteresis:
+                return None
+            self.active = False
+            return False
+        if (self.above is not None and value > self.above) or (self.below is not None and value < self.below):
+            self.active = True
+            return True
+        return None
+
+
+def load_rules(path='alerts.json'):
+    global mqtt
+    try:
+        with open(path) as f:
+            config = ujson.load(f)
+    except (OSError, ValueError) as e:
+        print(f"No usable {path} ({e}), no alert rules loaded.")
+        return rules
+    for cfg in config.get('rules', []):
+        try:
+            rules.append(Rule(cfg))
+        except KeyError as e:
+            print(f"Alert rule is missing {e}.")
+    broker = config.get('mqtt')
+    if broker and 'broker' in broker:
+        mqtt = broker
+    return rules
+
+
+def _mqtt_connect():
+    from umqtt.simple import MQTTClient
+    client = MQTTClient(mqtt.get('client_id', 'netmaster'), mqtt['broker'])
+    client.connect()
+    client.sock.settimeout(MQTT_TIMEOUT_S)
+    return client
+
+def _mqtt_worker():
+    """Send queued MQTT messages; runs in its own thread."""
+    client = None
+    while True:
+        if not _mqtt_queue:
+            time.sleep_ms(100)
+            continue
+        if client is None:
+            try:
+                client = _mqtt_connect()
+            except Exception as e:
+                print(f"MQTT connect failed: {e}")
+                time.sleep_ms(MQTT_RETRY_MS)
+                continue
+        item = _mqtt_queue.pop(0)
+        try:
+            client.publish(*item)
+        except Exception as e:
+            print(f"MQTT publish failed: {e}")
+            _mqtt_queue.insert(0, item)
+            try:
+                client.sock.close()
+            except Exception:
+                pass
+            client = None
+
+
+def add_client(cl):
+    """Turn a freshly accepted socket into a Server-Sent Events subscriber."""
+    cl.sendall(b'HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nCache-Control: no-cache\r\n\r\n')
+    # publish() runs on the sensor scheduler thread and must never wait for a client
+    cl.setblocking(False)
+    clients.append(cl)
+    if len(clients) > MAX_CLIENTS:
+        clients.pop(0).close()
+
+def _drop(cl):
+    # add_client() may already have evicted it on the web server thread
+    if cl in clients:
+        clients.remove(cl)
+    cl.close()
+
+def publish(kind, event):
+    message = ujson.dumps(event)
+    frame = f"event: {kind}\ndata: {message}\n\n".encode()
+    for cl in clients[:]:
+        # A client that cannot take a whole frame right away is too slow; drop it
+        # rather than stall sampling or leave half a frame on the stream
+        try:
+            sent = cl.send(frame)
+        except OSError:
+            _drop(cl)
+            continue
+        if sent != len(frame):
+            _drop(cl)
+    if mqtt:
+        _mqtt_queue.append((f"{mqtt.get('topic', 'netmaster/events')}/{kind}", message))
+        if len(_mqtt_queue) > MQTT_QUEUE_LEN:
+            _mqtt_queue.pop(0)
+
+def _run_actions(rule, event):
+    for name in rule.actions:
+        if name == 'push':
+            publish('alert', event)
+            continue
+        fn = actions.get(name)
+        if fn:
+            try:
+                fn(event)
+            except Exception as e:
+                print(f"Alert action {name} failed: {e}")
+
+
+def on_sample(name, fields, ts, values):
+    now_ms = time.ticks_ms()
+    changed = {}
+    for i in range(len(fields)):
+        key = (name, fields[i])
+        stream = streams.get(key)
+        if stream is None:
+            stream = streams[key] = Stream()
+        if stream.value != values[i]:
+            changed[fields[i]] = values[i]
+        stream.add(ts, values[i], now_ms)
+
+    for rule in rules:
+        if rule.sensor != name:
+            continue
+        stream = streams.get((name, rule.field))
+        if stream is None:
+            continue
+        value = stream.metric(rule.metric)
+        state = rule.check(value)
+        if state is None:
+            continue
+        _run_actions(rule, {
+            'rule': rule.name,
+            'state': 'fired' if state else 'cleared',
+            'sensor': name,
+            'field': rule.field,
+            'metric': rule.metric,
+            'value': value,
+            'timestamp': ts,
+        })
+
+    if changed and (clients or mqtt):
+        publish('reading', {'sensor': name, 'timestamp': ts, 'values': changed})
+
+def attach(path='alerts.json'):
+    """Load the alert rules and start following the sensor scheduler."""
+    load_rules(path)
+    if mqtt:
+        _thread.start_new_thread(_mqtt_worker, ())
+    sensor_handler.subscribe(on_sample)
+
+
+def stats_json():
+    result = {}
+    for key, stream in streams.items():
+        result.setdefault(key[0], {})[key[1]] = stream.to_dict()
+    return ujson.dumps({
+        'sensors': result,
+        'alerts': {rule.name: rule.active for rule in rules},
+    })